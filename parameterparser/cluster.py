@@ -1,24 +1,88 @@
 import sys
 import os
+from parameterparser.parameter import Parameter
 from parameterparser.usage_style import UsageStyle
+from parameterparser.suggestion import SuggestionIndex
+from parameterparser.completion import CompletionIndex
+from parameterparser.record import ResultRecord
 
 
 class Cluster:
     """
     Class for representing a Cluster of Parameters
 
+    The lookup indexes below are kept up to date as Parameters are added,
+    removed or changed, so that nothing has to be rebuilt when parsing.
+
     Attributes:
-        :var prefixes: The map of prefixes and parameters.
+        :var prefixes: The map of prefixes and parameters, including
+                       a Parameter for each Alias.
         :var default:  The default handler for unknown parameters.
+        :var positionals: The positional Parameters, in order.
+        :var tokens: The map of parameter strings and the Parameter each
+                     one resolves to, preferring the longest prefix. The
+                     Parameter for an Alias has the aliased Parameter as
+                     its parent.
+        :var required: The map of (prefix, name) and required Parameters.
+        :var halting: The map of parameter strings of halting Parameters
+                      and Aliases and the number of Parameters using them.
+        :var version: The number of times this Cluster has changed.
+        :var constraints: The constraints between Parameters, as tuples of
+                          the kind, the names and the dependency names.
+        :var bits: The map of the names of the Parameters and positional
+                   Parameters in this Cluster and the bit representing each
+                   one in the constraint masks. The bit of a name that is
+                   removed is reused.
+        :var suggestion_count: The number of suggestions to make for
+                               unknown parameters, 0 if disabled.
+        :var suggestion_distance: The maximum edit distance of a suggestion.
+
+    Constant Constraint Kinds:
+        :const CONSTRAINT_EXACTLY_ONE: Exactly one of the names is found.
+        :const CONSTRAINT_AT_MOST_ONE: At most one of the names is found.
+        :const CONSTRAINT_DEPENDENCY: If the name is found, so are all of
+                                      the dependency names.
     """
     prefixes = {}
     default = None
 
+    # Constraint Kinds
+    CONSTRAINT_EXACTLY_ONE = "exactly_one"
+    CONSTRAINT_AT_MOST_ONE = "at_most_one"
+    CONSTRAINT_DEPENDENCY = "dependency"
+
     def __init__(self):
         """
         Initialize the Cluster.
         """
-        self._default = lambda param: -1
+        self.prefixes = dict()
+        self.default = lambda param: -1
+        self.positionals = []
+        self.tokens = dict()
+        self.required = dict()
+        self.halting = dict()
+        self.version = 0
+        self.constraints = []
+        self.bits = dict()
+        self.suggestion_count = 0
+        self.suggestion_distance = 2
+        self.__parameters = dict()
+        self.__bit_counts = dict()
+        self.__free_bits = []
+        self.__indexed = dict()
+        self.__claims = dict()
+        self.__unmeasured = dict()
+        self.__usage_widths = dict(
+            (style_name, dict()) for style_name in UsageStyle.all(0).keys()
+        )
+        self.__suggestion_index = None
+        self.__suggestion_version = None
+        self.__completion_index = None
+        self.__completion_version = None
+        self.__constraint_masks = []
+        self.__constraint_version = None
+        self.__result_type = None
+        self.__result_type_version = None
 
     def add(self, parameter):
         """
@@ -26,9 +90,22 @@ class Cluster:
         :param parameter: The Parameter
         :return:          The cluster following the Fluent design pattern.
         """
-        if parameter.prefix not in self.prefixes.keys():
-            self.prefixes[parameter.prefix] = dict()
-        self.prefixes[parameter.prefix][parameter.name] = parameter
+        for positional in self.positionals:
+            if positional.name == parameter.name:
+                raise Exception(
+                    "Parameter Parser already has a positional Parameter "
+                    "named: " + parameter.name
+                )
+        key = (parameter.prefix, parameter.name)
+        if key in self.__parameters:
+            self.__unindex(self.__parameters[key])
+            self.__parameters[key].clusters.remove(self)
+        else:
+            self.__claim_bit(parameter.name)
+        self.__parameters[key] = parameter
+        parameter.clusters.append(self)
+        self.__index(parameter)
+        self.version += 1
         return self
 
     def remove(self, prefix, name):
@@ -38,7 +115,11 @@ class Cluster:
         :param name:   The Name.
         :return:       The cluster following the Fluent design pattern.
         """
-        del self.prefixes[prefix][name]
+        parameter = self.__parameters.pop((prefix, name))
+        parameter.clusters.remove(self)
+        self.__unindex(parameter)
+        self.__release_bit(name)
+        self.version += 1
         return self
 
     def add_many(self, parameters):
@@ -51,6 +132,151 @@ class Cluster:
             self.add(parameter)
         return self
 
+    def reindex(self, parameter):
+        """
+        Update the indexes for a Parameter in this Cluster after it has
+        changed. This is called by the Parameter itself.
+        :param parameter: The Parameter.
+        :return:          The cluster following the Fluent design pattern.
+        """
+        self.__unindex(parameter)
+        self.__index(parameter)
+        self.version += 1
+        return self
+
+    def add_positional(self, name, closure, required=False):
+        """
+        Add a positional Parameter to the Cluster. Arguments that do not
+        start with a known prefix fill the positional Parameters in the
+        order they were added, each taking as many arguments as its
+        closure does. A variadic closure takes every remaining argument
+        and must be the last positional Parameter. The name must not be
+        used by any other Parameter in the Cluster.
+        :param name:     The name.
+        :param closure:  The closure.
+        :param required: Whether the positional Parameter is required.
+        :return:         The cluster following the Fluent design pattern.
+        """
+        if len(self.positionals) > 0 \
+                and self.positionals[-1].get_arg_spec().varargs is not None:
+            raise Exception(
+                "Parameter Parser only supports a variadic positional "
+                "Parameter as the last positional Parameter."
+            )
+        if name in self.bits:
+            raise Exception(
+                "Parameter Parser already has a Parameter named: " + name
+            )
+        positional = Parameter("", name, closure)
+        positional.set_required(required)
+        self.__claim_bit(name)
+        self.positionals.append(positional)
+        self.version += 1
+        return self
+
+    def add_exactly_one(self, names):
+        """
+        Require exactly one of a group of Parameters to be found.
+        :param names: The names of the Parameters.
+        :return:      The cluster following the Fluent design pattern.
+        """
+        return self.__add_constraint(
+            Cluster.CONSTRAINT_EXACTLY_ONE, list(names), []
+        )
+
+    def add_at_most_one(self, names):
+        """
+        Allow at most one of a group of Parameters to be found.
+        :param names: The names of the Parameters.
+        :return:      The cluster following the Fluent design pattern.
+        """
+        return self.__add_constraint(
+            Cluster.CONSTRAINT_AT_MOST_ONE, list(names), []
+        )
+
+    def add_dependency(self, name, dependencies):
+        """
+        Require a group of Parameters to be found whenever a Parameter is.
+        :param name:         The name of the Parameter.
+        :param dependencies: The names of the Parameters it depends on.
+        :return:             The cluster following the Fluent design pattern.
+        """
+        return self.__add_constraint(
+            Cluster.CONSTRAINT_DEPENDENCY, [name], list(dependencies)
+        )
+
+    def get_constraint_masks(self):
+        """
+        Retrieve the constraints compiled into bit masks over the bits of
+        the Parameters. The masks are compiled the first time this is
+        called and again after the Cluster has changed. Compiling fails if
+        a constraint refers to a name that is not in the Cluster.
+        :return: The constraints, as tuples of the kind, the mask of the
+                 names, the mask of the dependency names and the constraint.
+        """
+        if self.__constraint_version != self.version:
+            self.__constraint_masks = [
+                (kind, self.__get_mask(names), self.__get_mask(dependencies),
+                 (kind, names, dependencies))
+                for kind, names, dependencies in self.constraints
+            ]
+            self.__constraint_version = self.version
+        return self.__constraint_masks
+
+    def __add_constraint(self, kind, names, dependencies):
+        """
+        Add a constraint between Parameters.
+        :param kind:         The kind of constraint.
+        :param names:        The names of the Parameters.
+        :param dependencies: The names of the Parameters depended on.
+        :return:             The cluster following the Fluent design pattern.
+        """
+        self.constraints.append((kind, names, dependencies))
+        self.version += 1
+        return self
+
+    def __get_mask(self, names):
+        """
+        Retrieve the bit mask for a group of Parameter names.
+        :param names: The names.
+        :return:      The bit mask.
+        """
+        mask = 0
+        for name in names:
+            if name not in self.bits:
+                raise Exception(
+                    "Parameter Parser constraint refers to an unknown "
+                    "Parameter: " + name
+                )
+            mask |= self.bits[name]
+        return mask
+
+    def __claim_bit(self, name):
+        """
+        Claim the bit for a Parameter name, assigning a free bit
+        if the name does not have one yet.
+        :param name: The name.
+        """
+        if name in self.bits:
+            self.__bit_counts[name] += 1
+            return
+        if len(self.__free_bits) > 0:
+            self.bits[name] = self.__free_bits.pop()
+        else:
+            self.bits[name] = 1 << len(self.bits)
+        self.__bit_counts[name] = 1
+
+    def __release_bit(self, name):
+        """
+        Release a claim made using __claim_bit, freeing the bit
+        once no Parameter uses the name.
+        :param name: The name.
+        """
+        self.__bit_counts[name] -= 1
+        if self.__bit_counts[name] == 0:
+            del self.__bit_counts[name]
+            self.__free_bits.append(self.bits.pop(name))
+
     def set_default(self, default):
         """
         Set the Default handler for the Cluster.
@@ -60,6 +286,215 @@ class Cluster:
         self.default = default
         return self
 
+    def set_suggestions(self, count=3, max_distance=2):
+        """
+        Enable suggestions for unknown parameters. When enabled, an
+        unknown parameter will raise a ParseException carrying the
+        closest matching parameters.
+        :param count:        The number of suggestions, 0 to disable.
+        :param max_distance: The maximum edit distance of a suggestion.
+        :return:             The cluster following the Fluent design pattern.
+        """
+        self.suggestion_count = count
+        self.suggestion_distance = max_distance
+        return self
+
+    def suggest(self, parameter_str, count=3, max_distance=2):
+        """
+        Retrieve the parameters closest to an unknown parameter string.
+        The index is built the first time this is called and again
+        after the Cluster has changed. This does not depend on whether
+        suggestions are enabled using set_suggestions().
+        :param parameter_str: The parameter string.
+        :param count:         The maximum number of suggestions.
+        :param max_distance:  The maximum edit distance of a suggestion.
+        :return:              The closest parameter strings, closest first.
+        """
+        if self.__suggestion_version != self.version:
+            self.__suggestion_index = SuggestionIndex(self.tokens.keys())
+            self.__suggestion_version = self.version
+        return self.__suggestion_index.suggest(
+            parameter_str, count, max_distance
+        )
+
+    def complete(self, words, position):
+        """
+        Complete the word at a position on a command line.
+        :param words:    The words of the command line, including the binary.
+        :param position: The index of the word being completed.
+        :return:         The matching parameter strings, or an empty list if
+                         the word is an argument to a Parameter.
+        """
+        return self.get_completion_index().complete(words, position)
+
+    def get_completion_index(self):
+        """
+        Retrieve the completion index for this Cluster. The index is built
+        the first time this is called and again after the Cluster has
+        changed.
+        :return: The CompletionIndex.
+        """
+        if self.__completion_version != self.version:
+            self.__completion_index = CompletionIndex.from_cluster(self)
+            self.__completion_version = self.version
+        return self.__completion_index
+
+    def get_result_type(self):
+        """
+        Retrieve the record type for the results of this Cluster, with one
+        field per Parameter and positional Parameter filled with their
+        default values. The type is created the first time this is called
+        and again after the Cluster has changed.
+        :return: The record type.
+        """
+        if self.__result_type_version != self.version:
+            names = []
+            defaults = []
+            for parameter in list(self.__parameters.values()) \
+                    + self.positionals:
+                if parameter.name not in names:
+                    names.append(parameter.name)
+                    defaults.append(parameter.default_value)
+            self.__result_type = ResultRecord.create_type(names, defaults)
+            self.__result_type_version = self.version
+        return self.__result_type
+
+    def get_usage_widths(self):
+        """
+        Retrieve the width of the widest value in each usage style column
+        for the Parameters in this Cluster. Parameters are measured the
+        first time this is called after they have been added or changed.
+        :return: The map of usage style column names and widths.
+        """
+        usage_styles = UsageStyle.all(0)
+        for key in list(self.__unmeasured.keys()):
+            parameter = self.__unmeasured[key]
+            measured = dict(
+                (style_name, len(style["fetch"](parameter)))
+                for style_name, style in usage_styles.items()
+            )
+            for style_name, width in measured.items():
+                style_widths = self.__usage_widths[style_name]
+                style_widths[width] = style_widths.get(width, 0) + 1
+            self.__indexed[key][2].update(measured)
+            del self.__unmeasured[key]
+        return dict(
+            (style_name, max(widths.keys()) if len(widths) > 0 else 0)
+            for style_name, widths in self.__usage_widths.items()
+        )
+
+    def __index(self, parameter):
+        """
+        Add a Parameter and a Parameter for each of its Aliases
+        to the indexes.
+        :param parameter: The Parameter.
+        """
+        key = (parameter.prefix, parameter.name)
+        self.__claim(parameter.prefix, parameter.name)
+        alias_parameters = []
+        for alias_prefix, alias_name in parameter.aliases.items():
+            alias_parameter = Parameter(
+                alias_prefix, alias_name, parameter.closure
+            )
+            alias_parameter.parent = parameter
+            alias_parameters.append(alias_parameter)
+            self.__claim(alias_prefix, alias_name, alias_parameter)
+        if parameter.required:
+            self.required[key] = parameter
+        halting = []
+        if parameter.halting:
+            for halting_parameter in [parameter] + alias_parameters:
+                token = halting_parameter.prefix + halting_parameter.name
+                self.halting[token] = self.halting.get(token, 0) + 1
+                halting.append(token)
+        self.__unmeasured[key] = parameter
+        self.__indexed[key] = (alias_parameters, halting, dict())
+
+    def __unindex(self, parameter):
+        """
+        Remove everything added to the indexes by __index for a Parameter.
+        :param parameter: The Parameter.
+        """
+        key = (parameter.prefix, parameter.name)
+        alias_parameters, halting, widths = self.__indexed.pop(key)
+        self.__unmeasured.pop(key, None)
+        self.required.pop(key, None)
+        self.__release(parameter.prefix, parameter.name)
+        for alias_parameter in alias_parameters:
+            self.__release(
+                alias_parameter.prefix, alias_parameter.name, alias_parameter
+            )
+        for token in halting:
+            self.halting[token] -= 1
+            if self.halting[token] == 0:
+                del self.halting[token]
+        for style_name, width in widths.items():
+            style_widths = self.__usage_widths[style_name]
+            style_widths[width] -= 1
+            if style_widths[width] == 0:
+                del style_widths[width]
+
+    def __claim(self, prefix, name, alias_parameter=None):
+        """
+        Claim a prefix and name for a Parameter, or for an Alias if an
+        alias Parameter is given. A Parameter always takes precedence over
+        an Alias, and a later Alias over an earlier one.
+        :param prefix:          The prefix.
+        :param name:            The name.
+        :param alias_parameter: The alias Parameter, if any.
+        """
+        if alias_parameter is not None:
+            key = (prefix, name)
+            if key not in self.__claims:
+                self.__claims[key] = []
+            self.__claims[key].append(alias_parameter)
+        self.__refresh(prefix, name)
+
+    def __release(self, prefix, name, alias_parameter=None):
+        """
+        Release a claim made using __claim.
+        :param prefix:          The prefix.
+        :param name:            The name.
+        :param alias_parameter: The alias Parameter, if any.
+        """
+        if alias_parameter is not None:
+            claims = self.__claims[(prefix, name)]
+            claims.remove(alias_parameter)
+            if len(claims) == 0:
+                del self.__claims[(prefix, name)]
+        self.__refresh(prefix, name)
+
+    def __refresh(self, prefix, name):
+        """
+        Update the Parameter a prefix and name resolve to, and the
+        Parameter its parameter string resolves to.
+        :param prefix: The prefix.
+        :param name:   The name.
+        """
+        token = prefix + name
+        parameter = self.__parameters.get((prefix, name))
+        if parameter is None:
+            claims = self.__claims.get((prefix, name))
+            parameter = None if claims is None else claims[-1]
+        if parameter is not None:
+            if prefix not in self.prefixes:
+                self.prefixes[prefix] = dict()
+            self.prefixes[prefix][name] = parameter
+        elif prefix in self.prefixes and name in self.prefixes[prefix]:
+            del self.prefixes[prefix][name]
+            if len(self.prefixes[prefix]) == 0:
+                del self.prefixes[prefix]
+        longest = None
+        for candidate in self.prefixes.keys():
+            if token[:len(candidate)] == candidate \
+                    and token[len(candidate):] in self.prefixes[candidate]:
+                if longest is None or len(longest) < len(candidate):
+                    longest = candidate
+        if longest is None:
+            self.tokens.pop(token, None)
+        else:
+            self.tokens[token] = self.prefixes[longest][token[len(longest):]]
+
     def get_usage(self, required_first=False, custom_binary=None):
         """
         Retrieve the Usage for this Cluster as a String.
@@ -84,6 +519,11 @@ class Cluster:
                 parameter = parameters[parameter_name]
                 if not parameter.has_parent():
                     full_usage += parameter.get_usage() + " "
+        for positional in self.positionals:
+            usage = positional.get_properties_usage()
+            full_usage += (
+                usage if positional.required else "[" + usage + "]"
+            ) + " "
 
         return full_usage
 
@@ -114,6 +554,12 @@ class Cluster:
         sys.stdout.write(self.get_usage(required_first, custom_binary))
         sys.stdout.write(os.linesep+os.linesep)
         usage_styles = UsageStyle.all_except(excluding, column_padding)
+        usage_widths = self.get_usage_widths()
+        for style_name in usage_styles.keys():
+            usage_styles[style_name]["longest"] = max(
+                usage_styles[style_name]["longest"],
+                usage_widths[style_name] + column_padding
+            )
         parameter_count = 0
         for prefix in self.prefixes.keys():
             parameters = self.prefixes[prefix]
@@ -123,12 +569,7 @@ class Cluster:
                     parameter_count += 1
                     for style_name in usage_styles.keys():
                         style = usage_styles[style_name]
-                        n_val = style["fetch"](parameter)
-                        n_val_size = len(n_val)
-                        if n_val_size + column_padding > style["longest"]:
-                            usage_styles[style_name]["longest"] \
-                                = n_val_size + column_padding
-                        usage_styles[style_name]["values"].append(n_val)
+                        style["values"].append(style["fetch"](parameter))
         sys.stdout.write("Parameters:"+os.linesep+os.linesep)
         header_format = "\t"
         column_names = []
@@ -0,0 +1,17 @@
+import sys
+from parameterparser.completion import CompletionIndex
+
+
+def main(argv):
+    """
+    Print the completions for a command line using a cache file.
+    Usage: python -m parameterparser.complete <cache> <position> <words...>
+    :param argv: The string array to use.
+    """
+    index = CompletionIndex.load(argv[1])
+    for token in index.complete(argv[3:], int(argv[2])):
+        sys.stdout.write(token + "\n")
+
+
+if __name__ == "__main__":
+    main(sys.argv)
@@ -0,0 +1,177 @@
+import bisect
+import json
+import re
+
+try:
+    from shlex import quote
+except ImportError:
+    # noinspection PyUnresolvedReferences
+    from pipes import quote
+
+
+class CompletionIndex:
+    """
+    A sorted index over the tokens of a Cluster used to complete a
+    partial token without rebuilding or scanning the Cluster.
+
+    Attributes:
+        :var prefixes: The prefixes used by the indexed tokens.
+        :var tokens: The sorted list of prefixed names and aliases.
+        :var arities: The map of tokens to their (count, variadic) arity.
+    """
+
+    def __init__(self, arities=None, prefixes=None):
+        """
+        Create a new CompletionIndex.
+        :param arities:  The map of tokens to their (count, variadic) arity.
+        :param prefixes: The prefixes used by the tokens.
+        """
+        self.arities = dict() if arities is None else arities
+        self.tokens = sorted(self.arities.keys())
+        self.prefixes = sorted(
+            [] if prefixes is None else prefixes, key=len, reverse=True
+        )
+
+    @staticmethod
+    def from_cluster(cluster):
+        """
+        Build a CompletionIndex from the Parameters in a Cluster.
+        :param cluster: The Cluster.
+        :return:        The CompletionIndex.
+        """
+        arities = dict()
+        for token, parameter in cluster.tokens.items():
+            if parameter.has_parent():
+                parameter = parameter.parent
+            arg_spec = parameter.get_arg_spec()
+            arities[token] = (len(arg_spec.args), arg_spec.varargs is not None)
+        return CompletionIndex(arities, list(cluster.prefixes.keys()))
+
+    @staticmethod
+    def load(path):
+        """
+        Load a CompletionIndex previously written using save().
+        :param path: The path to the cache file.
+        :return:     The CompletionIndex.
+        """
+        with open(path, "r") as cache:
+            data = json.load(cache)
+        return CompletionIndex(dict(
+            (token, (count, variadic))
+            for token, count, variadic in data["tokens"]
+        ), data["prefixes"])
+
+    def save(self, path):
+        """
+        Write this CompletionIndex to a cache file.
+        :param path: The path to the cache file.
+        :return:     This index following the Fluent design pattern.
+        """
+        with open(path, "w") as cache:
+            json.dump({
+                "prefixes": self.prefixes,
+                "tokens": [
+                    [token, self.arities[token][0], self.arities[token][1]]
+                    for token in self.tokens
+                ]
+            }, cache)
+        return self
+
+    def complete(self, words, position):
+        """
+        Complete the word at a position on a command line.
+        :param words:    The words of the command line, including the binary.
+        :param position: The index of the word being completed.
+        :return:         The matching tokens, or an empty list if the word
+                         is an argument to a Parameter.
+        """
+        partial = words[position] if position < len(words) else ""
+        if self.in_argument_slot(words, position):
+            return []
+        start = bisect.bisect_left(self.tokens, partial)
+        end = bisect.bisect_left(self.tokens, partial + u"\uffff", start)
+        return self.tokens[start:end]
+
+    def in_argument_slot(self, words, position):
+        """
+        Check if the word at a position is an argument to a Parameter.
+        :param words:    The words of the command line, including the binary.
+        :param position: The index of the word being completed.
+        :return:         True if the word is an argument to a Parameter.
+        """
+        remaining = 0
+        variadic = False
+        consumed = 0
+        for word in words[1:position]:
+            if remaining > 0:
+                remaining -= 1
+            elif variadic and not self.__has_prefix(word):
+                consumed += 1
+            elif word in self.arities:
+                remaining, variadic = self.arities[word]
+                consumed = 0
+            else:
+                variadic = False
+        if remaining > 0:
+            return True
+        if variadic:
+            partial = words[position] if position < len(words) else ""
+            return consumed == 0 or not self.__has_prefix(partial)
+        return False
+
+    def __has_prefix(self, word):
+        """
+        Check if a word starts with one of the indexed prefixes.
+        :param word: The word.
+        :return:     True if it starts with a prefix.
+        """
+        for prefix in self.prefixes:
+            if word[:len(prefix)] == prefix:
+                return True
+        return False
+
+    @staticmethod
+    def get_bash_script(binary, cache_path, python="python"):
+        """
+        Generate a bash completion script calling the cached entry point.
+        :param binary:     The binary to complete.
+        :param cache_path: The path to a cache file written using save().
+        :param python:     The python interpreter to invoke.
+        :return:           The script.
+        """
+        function = "_" + re.sub(r"\W", "_", binary) + "_complete"
+        return (
+            function + "() {\n"
+            "    local IFS=$'\\n'\n"
+            "    COMPREPLY=($(" + quote(python)
+            + " -m parameterparser.complete " + quote(cache_path)
+            + " \"$COMP_CWORD\" \"${COMP_WORDS[@]}\" 2>/dev/null))\n"
+            "}\n"
+            "complete -o default -F " + function + " " + quote(binary) + "\n"
+        )
+
+    @staticmethod
+    def get_zsh_script(binary, cache_path, python="python"):
+        """
+        Generate a zsh completion script calling the cached entry point.
+        :param binary:     The binary to complete.
+        :param cache_path: The path to a cache file written using save().
+        :param python:     The python interpreter to invoke.
+        :return:           The script.
+        """
+        function = "_" + re.sub(r"\W", "_", binary) + "_complete"
+        return (
+            "#compdef " + binary + "\n"
+            + function + "() {\n"
+            "    local -a matches\n"
+            "    matches=(\"${(@f)$(" + quote(python)
+            + " -m parameterparser.complete " + quote(cache_path)
+            + " \"$((CURRENT - 1))\" \"${words[@]}\" 2>/dev/null)}\")\n"
+            "    if [[ -n \"${matches[1]}\" ]]; then\n"
+            "        compadd -Q -- \"${matches[@]}\"\n"
+            "    else\n"
+            "        _files\n"
+            "    fi\n"
+            "}\n"
+            "compdef " + function + " " + quote(binary) + "\n"
+        )
@@ -6,6 +6,7 @@ class ParseException(Exception):
         :var parameter: The parameter that caused this Exception, if any.
         :var message: The Message for this Exception.
         :var code: The error code.
+        :var suggestions: The closest known parameters, if any.
 
     Constant Error Codes:
         See: https://git.io/fj1DN
@@ -14,6 +15,10 @@ class ParseException(Exception):
         :const INVALID_ARGUMENT_COUNT_VARIADIC_ALIAS: 60003
         :const INVALID_ARGUMENT_COUNT_VARIADIC_PARAMETER: 60004
         :const MISSING_REQUIRED_ARGUMENT: 60005
+        :const UNKNOWN_PARAMETER: 60006
+        :const EXACTLY_ONE_REQUIRED: 60007
+        :const MUTUALLY_EXCLUSIVE: 60008
+        :const MISSING_DEPENDENCY: 60009
     """
 
     # Error Codes
@@ -22,18 +27,24 @@ class ParseException(Exception):
     INVALID_ARGUMENT_COUNT_VARIADIC_ALIAS = 60003
     INVALID_ARGUMENT_COUNT_VARIADIC_PARAMETER = 60004
     MISSING_REQUIRED_ARGUMENT = 60005
+    UNKNOWN_PARAMETER = 60006
+    EXACTLY_ONE_REQUIRED = 60007
+    MUTUALLY_EXCLUSIVE = 60008
+    MISSING_DEPENDENCY = 60009
 
-    def __init__(self, message, code, parameter=None):
+    def __init__(self, message, code, parameter=None, suggestions=None):
         """
         Initialize this Exception.
-        :param message:   The message.
-        :param code:      The Code.
-        :param parameter: The Parameter if any.
+        :param message:     The message.
+        :param code:        The Code.
+        :param parameter:   The Parameter if any.
+        :param suggestions: The closest known parameters, if any.
         """
         super(ParseException, self).__init__(message)
         self.message = message
         self.code = code
         self.parameter = parameter
+        self.suggestions = [] if suggestions is None else suggestions
 
     def __str__(self):
         """
@@ -14,8 +14,25 @@ class Parameter:
         :var parent: The parent Parameter for this Parameter, if any.
         :var description: The Description for this Parameter.
         :var required: Whether this Parameter is required, default False.
+        :var halting: Whether this Parameter halts the Parser before
+                      anything else is parsed, default False.
+        :var accumulate: How repeated values for this Parameter are stored,
+                         default ACCUMULATE_LAST.
+        :var default_value: The value used in result records when this
+                            Parameter is not found, default None.
+        :var clusters: The Clusters this Parameter has been added to.
+
+    Constant Accumulation Modes:
+        :const ACCUMULATE_LAST: Store the last value.
+        :const ACCUMULATE_APPEND: Store a list of every value.
+        :const ACCUMULATE_COUNT: Store the number of occurrences.
     """
 
+    # Accumulation Modes
+    ACCUMULATE_LAST = "last"
+    ACCUMULATE_APPEND = "append"
+    ACCUMULATE_COUNT = "count"
+
     def __init__(self, prefix, name, closure):
         """
         Create a new Parameter.
@@ -30,6 +47,12 @@ class Parameter:
         self.parent = None
         self.description = None
         self.required = False
+        self.halting = False
+        self.accumulate = Parameter.ACCUMULATE_LAST
+        self.default_value = None
+        self.clusters = []
+        self.__arg_spec = None
+        self.__arg_spec_closure = None
 
     def has_parent(self):
         """
@@ -45,6 +68,19 @@ class Parameter:
         :return: This Parameter following the Fluent design pattern..
         """
         self.required = required
+        self.__reindex()
+        return self
+
+    def set_halting(self, halting):
+        """
+        Set this Parameter as Halting. When a halting Parameter is found
+        anywhere in the array of strings, the Parser will only parse it
+        and then halt, without verifying the required Parameters.
+        :param halting: The value.
+        :return: This Parameter following the Fluent design pattern..
+        """
+        self.halting = halting
+        self.__reindex()
         return self
 
     def set_description(self, description):
@@ -54,6 +90,31 @@ class Parameter:
         :return: This Parameter following the Fluent design pattern..
         """
         self.description = description
+        self.__reindex()
+        return self
+
+    def set_default_value(self, default_value):
+        """
+        Set the value used in result records when this Parameter is not
+        found. The value is shared between records, so prefer immutable
+        values.
+        :param default_value: The default value.
+        :return: This Parameter following the Fluent design pattern..
+        """
+        self.default_value = default_value
+        self.__reindex()
+        return self
+
+    def set_accumulate(self, accumulate):
+        """
+        Set how the values for this Parameter are stored when it is
+        found more than once. Use one of the ACCUMULATE_ constants, or a
+        reducer taking the stored value and the new value and returning
+        the value to store. With ACCUMULATE_COUNT the closure is not called.
+        :param accumulate: The accumulation mode or reducer.
+        :return: This Parameter following the Fluent design pattern..
+        """
+        self.accumulate = accumulate
         return self
 
     def add_alias(self, name, prefix=None):
@@ -68,8 +129,16 @@ class Parameter:
             self.aliases[self.prefix] = name
         else:
             self.aliases[prefix] = name
+        self.__reindex()
         return self
 
+    def __reindex(self):
+        """
+        Update the indexes of every Cluster this Parameter is in.
+        """
+        for cluster in self.clusters:
+            cluster.reindex(self)
+
     def get_usage(self, encapsulate=True, with_aliases=True):
         """
         Retrieve the Usage for this Parameter as a String.
@@ -109,12 +178,14 @@ class Parameter:
         Retrieve the arg spec for this Parameters closure argument.
         :return: The argspec (2.7+) or fullargspec (3.0+)
         """
-        if sys.version_info[0] < 3:
-            # noinspection PyDeprecation
-            arg_spec = inspect.getargspec(self.closure)
-        else:
-            arg_spec = inspect.getfullargspec(self.closure)
-        return arg_spec
+        if self.__arg_spec_closure is not self.closure:
+            if sys.version_info[0] < 3:
+                # noinspection PyDeprecation
+                self.__arg_spec = inspect.getargspec(self.closure)
+            else:
+                self.__arg_spec = inspect.getfullargspec(self.closure)
+            self.__arg_spec_closure = self.closure
+        return self.__arg_spec
 
     def get_properties_usage(self):
         """
@@ -128,7 +199,8 @@ class Parameter:
         if arg_spec.varargs is not None:
             result += ("" if result == "" else " ") + "<"
             result += arg_spec.varargs + ", ...>"
-        if arg_spec.varkw is not None:
+        if getattr(arg_spec, "varkw", getattr(arg_spec, "keywords", None)) \
+                is not None:
             raise Exception("Parameter Parser does not support ** arguments.")
 
         return result
@@ -25,6 +25,7 @@ class Parser:
         """
         self.error_handler = None
         self.__argv = None
+        self.__halting = None
         self.cluster = Cluster()
         self.__initialize(argv, cluster)
 
@@ -39,6 +40,25 @@ class Parser:
         self.__check_validity_and_continue_parse()
         return self.results
 
+    def parse_record(self, argv=None, cluster=None):
+        """
+        Parse the array of strings and retrieve the results as a record
+        with one field per Parameter in the cluster. Parameters that were
+        not found hold their default value, and results for unknown
+        parameters are not included. Values are written straight into the
+        fields of the record, so the results map is left empty.
+        :param argv:    The array of strings.
+        :param cluster: The Cluster
+        :return:        The results record.
+        """
+        self.__initialize(argv, cluster)
+        record_type = self.cluster.get_result_type()
+        self.__fields = record_type._indexes
+        self.__values = list(record_type._template)
+        self.__found = 0
+        self.__check_validity_and_continue_parse()
+        return tuple.__new__(record_type, self.__values)
+
     def set_error_handler(self, handler):
         """
         Set the error handler.
@@ -73,41 +93,64 @@ class Parser:
         # noinspection PyTypeChecker
         self.halted_by = None
         self.__cursor = 0
+        self.__positionals = []
+        self.__seen = 0
         self.results = {}
+        self.__fields = None
+        self.__accumulated = {}
         # noinspection PyTypeChecker
         self.invalid_param = None
         if cluster is not None:
             self.cluster = cluster
-            if argv is not None:
-                self.__preload_aliases()
         if argv is not None:
-            self.__preload_parameters(argv[:])
-
-    def __preload_aliases(self):
-        """
-        Load the Aliases for the cluster into their own
-        Parameter Objects so that they can properly be parsed.
-        """
-        dict_copy = dict(self.cluster.prefixes)
-        for prefix in dict_copy.keys():
-            parameters = dict_copy[prefix]
-            for parameter_key in parameters.keys():
-                parameter = parameters[parameter_key]
-                for alias_prefix in parameter.aliases.keys():
-                    alias_name = parameter.aliases[alias_prefix]
-                    alias_param = Parameter(
-                        alias_prefix,
-                        alias_name,
-                        parameter.closure
-                    )
-                    alias_param.parent = parameter
-                    self.cluster.add(alias_param)
+            self.__halting = self.__find_halting(argv)
+            if self.__halting is None:
+                self.__preload_parameters(argv[:])
+            else:
+                arg_spec = self.__halting[1].get_arg_spec()
+                self.__preload_parameters(
+                    argv[:1] + argv[self.__halting[0]:],
+                    None if arg_spec.varargs is not None
+                    else len(arg_spec.args) + 1
+                )
+
+    def __find_halting(self, argv):
+        """
+        Find the first halting Parameter in the array of strings, skipping
+        any strings that are part of a quote.
+        :param argv: The array of strings.
+        :return: The index of the halting Parameter and the Parameter,
+                 or None if there are no halting Parameters.
+        """
+        tokens = self.cluster.halting
+        if len(tokens) == 0:
+            return None
+        quote_type = None
+        for index in range(1, len(argv)):
+            parameter_str = argv[index]
+            if quote_type is not None:
+                if parameter_str[-1:] == quote_type:
+                    quote_type = None
+                continue
+            if len(parameter_str) > 1 and parameter_str[0] in "'\"":
+                if parameter_str[-1:] != parameter_str[0]:
+                    quote_type = parameter_str[0]
+                    continue
+                parameter_str = parameter_str[1:-1]
+            if parameter_str in tokens:
+                parameter = self.__get_parameter(parameter_str)
+                real = parameter \
+                    if not parameter.has_parent() else parameter.parent
+                if real.halting:
+                    return index, parameter
+        return None
 
-    def __preload_parameters(self, argv):
+    def __preload_parameters(self, argv, limit=None):
         """
         Preload the string of parameters to be parsed by joining
         entries that exist between quotes into their own single entry.
-        :param argv: The array of strings.
+        :param argv:  The array of strings.
+        :param limit: The number of entries to preload, if limited.
         """
         argv.pop(0)
         self.__argv = []
@@ -121,6 +164,8 @@ class Parser:
                     self.__parse_quote(argv, parsed, quote_type="\"")
                 else:
                     self.__argv.append(parsed)
+                if limit is not None and len(self.__argv) >= limit:
+                    break
                 parsed = argv.pop(0) if len(argv) > 0 else None
 
     def __parse_quote(self, argv, parameter_str, quote_type):
@@ -147,8 +192,13 @@ class Parser:
     def __check_validity_and_continue_parse(self):
         """
         Verify that all required parameters exist and continue parsing.
+        The constraints are compiled before any closure is called, so that
+        a constraint referring to an unknown name fails every parse.
         """
-        if not self.__validate_required():
+        self.__constraint_masks = self.cluster.get_constraint_masks()
+        if self.__halting is not None:
+            self.__parse_halting()
+        elif not self.__validate_required():
             error = ParseException(
                 "Missing required argument: " + self.invalid_param.name,
                 ParseException.MISSING_REQUIRED_ARGUMENT,
@@ -161,6 +211,19 @@ class Parser:
             self.valid = False
         else:
             self.__parse_every()
+            if self.is_valid() and self.halted_by is None:
+                self.__parse_positionals()
+            if self.is_valid() and self.halted_by is None:
+                self.__validate_constraints()
+
+    def __parse_halting(self):
+        """
+        Parse only the halting Parameter found in the array of strings
+        and halt, without verifying the required parameters.
+        """
+        self.__parse_single(self.__argv[0])
+        if self.is_valid():
+            self.halted_by = self.__halting[1]
 
     def __validate_required(self):
         """
@@ -168,23 +231,61 @@ class Parser:
         :return: True if all required parameters exist, false otherwise.
         """
         result = True
-        for prefix in self.cluster.prefixes.keys():
-            parameters = self.cluster.prefixes[prefix]
-            for parameter_key in parameters.keys():
-                parameter = parameters[parameter_key]
-                if parameter.required:
-                    if parameter.prefix + parameter.name not in self.__argv:
-                        alias_found = False
-                        for alias_prefix, alias in parameter.aliases.items():
-                            if alias_prefix + alias in self.__argv:
-                                alias_found = True
-                        if not alias_found:
-                            self.invalid_param = parameter \
-                                if self.invalid_param is None \
-                                else self.invalid_param
-                            result = False
+        argv = set(self.__argv)
+        for parameter in self.cluster.required.values():
+            if parameter.prefix + parameter.name not in argv:
+                alias_found = False
+                for alias_prefix, alias in parameter.aliases.items():
+                    if alias_prefix + alias in argv:
+                        alias_found = True
+                if not alias_found:
+                    self.invalid_param = parameter \
+                        if self.invalid_param is None \
+                        else self.invalid_param
+                    result = False
         return result
 
+    def __validate_constraints(self):
+        """
+        Verify the constraints between the parameters that were found,
+        using the bit masks compiled by the cluster.
+        """
+        seen = self.__seen
+        for kind, mask, dependency_mask, constraint in \
+                self.__constraint_masks:
+            if kind == Cluster.CONSTRAINT_DEPENDENCY:
+                if seen & mask and (seen & dependency_mask) != dependency_mask:
+                    self.__respond_constraint(
+                        constraint[1][0] + " requires: "
+                        + ", ".join(constraint[2]),
+                        ParseException.MISSING_DEPENDENCY
+                    )
+                continue
+            found = bin(seen & mask).count("1")
+            if kind == Cluster.CONSTRAINT_EXACTLY_ONE and found != 1:
+                self.__respond_constraint(
+                    "Expecting exactly one of: " + ", ".join(constraint[1]),
+                    ParseException.EXACTLY_ONE_REQUIRED
+                )
+            elif kind == Cluster.CONSTRAINT_AT_MOST_ONE and found > 1:
+                self.__respond_constraint(
+                    "Expecting at most one of: " + ", ".join(constraint[1]),
+                    ParseException.MUTUALLY_EXCLUSIVE
+                )
+
+    def __respond_constraint(self, message, code):
+        """
+        Respond to a constraint that was not met.
+        :param message: The message.
+        :param code:    The error code.
+        """
+        self.valid = False
+        error = ParseException(message, code)
+        if self.error_handler is not None:
+            self.error_handler(error)
+        else:
+            raise error
+
     def __parse_every(self):
         """
         Parse each parameter from the array of strings.
@@ -203,40 +304,108 @@ class Parser:
         if self.__prefix_exists(parameter_str):
             parameter = self.__get_parameter(parameter_str)
             if parameter is not None:
-                arg_spec = parameter.get_arg_spec()
-                args = list(arg_spec.args)
-                if len(args) > 0 or arg_spec.varargs is None:
-                    self.__parse_uniadic(parameter, len(args))
-                if arg_spec.varargs is not None:
-                    self.__parse_variadic(parameter)
+                halt = self.__parse_parameter(parameter)
                 if not self.is_valid():
                     return False
-                result_key = self.__get_real_name(parameter_str)
-                result = self.results[result_key]
-                if not isinstance(result, Result):
-                    if result == Result.HALT_PARSE:
-                        self.halted_by = parameter
-                        del self.results[result_key]
-                        return False
-                else:
-                    if result.should_halt():
-                        self.halted_by = parameter
-                        if result.value == Result.HALT_PARSE:
-                            del self.results[result_key]
-                        else:
-                            self.results[result_key] = result.value
-                        return False
+                if halt:
+                    self.halted_by = parameter
+                    return False
             else:
                 self.__respond_default(parameter_str)
+        elif len(self.cluster.positionals) > 0:
+            self.__positionals.append(parameter_str)
+            self.__increment_cursor()
         else:
             self.__respond_default(parameter_str)
         return True
 
+    def __parse_parameter(self, parameter):
+        """
+        Parse a Parameter and its arguments, calling its closure.
+        :param parameter: The parameter.
+        :return: True if the closure halted the parser.
+        """
+        real = parameter if not parameter.has_parent() else parameter.parent
+        arg_spec = real.get_arg_spec()
+        count = len(arg_spec.args)
+        closure_arguments = []
+        if count > 0 or arg_spec.varargs is None:
+            closure_arguments = self.__parse_uniadic(parameter, count)
+        else:
+            self.__increment_cursor()
+        if arg_spec.varargs is not None and closure_arguments is not None:
+            variadic_arguments = self.__parse_variadic(parameter)
+            closure_arguments = None if variadic_arguments is None \
+                else closure_arguments + variadic_arguments
+        if closure_arguments is None:
+            return False
+        self.__seen |= self.cluster.bits.get(real.name, 0)
+        if real.accumulate == Parameter.ACCUMULATE_COUNT:
+            self.__accumulate(real, 1)
+            return False
+        result = real.closure(*closure_arguments)
+        halt = False
+        if isinstance(result, Result):
+            if result.should_halt():
+                halt = True
+                result = result.value
+        elif result == Result.HALT_PARSE:
+            halt = True
+        if not halt or result != Result.HALT_PARSE:
+            self.__accumulate(real, result)
+        return halt
+
+    def __accumulate(self, parameter, value):
+        """
+        Store the value for a Parameter in the results, or in its field
+        when parsing a record, using the Parameter's accumulation mode.
+        Values are accumulated apart from the results, so that results
+        stored by the default handler under the same name are replaced
+        rather than accumulated into.
+        :param parameter: The parameter.
+        :param value:     The value, 1 for the count accumulation mode.
+        """
+        accumulate = parameter.accumulate
+        if self.__fields is not None:
+            index = self.__fields[parameter.name]
+            values = self.__values
+            if accumulate == Parameter.ACCUMULATE_LAST:
+                values[index] = value
+                return
+            bit = 1 << index
+            if not self.__found & bit:
+                values[index] = [value] \
+                    if accumulate == Parameter.ACCUMULATE_APPEND else value
+            elif accumulate == Parameter.ACCUMULATE_APPEND:
+                values[index].append(value)
+            elif accumulate == Parameter.ACCUMULATE_COUNT:
+                values[index] += value
+            else:
+                values[index] = accumulate(values[index], value)
+            self.__found |= bit
+            return
+        name = parameter.name
+        if accumulate == Parameter.ACCUMULATE_LAST:
+            self.results[name] = value
+            return
+        accumulated = self.__accumulated
+        if name not in accumulated:
+            accumulated[name] = [value] \
+                if accumulate == Parameter.ACCUMULATE_APPEND else value
+        elif accumulate == Parameter.ACCUMULATE_APPEND:
+            accumulated[name].append(value)
+        elif accumulate == Parameter.ACCUMULATE_COUNT:
+            accumulated[name] += value
+        else:
+            accumulated[name] = accumulate(accumulated[name], value)
+        self.results[name] = accumulated[name]
+
     def __parse_uniadic(self, parameter, count):
         """
-        Parse a Uniadic parameter and increment the cursor.
+        Parse the arguments for a Uniadic parameter and increment the cursor.
         :param parameter: The parameter.
         :param count:     The number of arguments.
+        :return: The arguments, or None if there were not enough.
         """
         closure_arguments = []
         current_argument = 0
@@ -245,76 +414,137 @@ class Parser:
             closure_arguments.append(self.__argv[self.__cursor + 1])
             current_argument += 1
             self.__increment_cursor()
+        self.__increment_cursor()
         if len(closure_arguments) == count:
-            name = parameter.name \
-                if not parameter.has_parent() \
-                else parameter.parent.name
-            self.results[name] = parameter.closure(*closure_arguments)
+            return closure_arguments
+        self.valid = False
+        error = ParseException(
+            "Invalid argument count. Expecting " +
+            str(count) + " but received "
+            + str(len(closure_arguments)) + ".",
+            ParseException.INVALID_ARGUMENT_COUNT_ALIAS
+            if parameter.has_parent()
+            else ParseException.INVALID_ARGUMENT_COUNT_PARAMETER,
+            parameter
+        )
+        if self.error_handler is not None:
+            self.error_handler(error)
         else:
-            self.valid = False
-            error = ParseException(
-                "Invalid argument count. Expecting " +
-                str(count) + " but received "
-                + str(len(closure_arguments)) + ".",
-                ParseException.INVALID_ARGUMENT_COUNT_ALIAS
-                if parameter.has_parent()
-                else ParseException.INVALID_ARGUMENT_COUNT_PARAMETER,
-                parameter
-            )
-            if self.error_handler is not None:
-                self.error_handler(error)
-            else:
-                raise error
-        self.__increment_cursor()
+            raise error
 
     def __parse_variadic(self, parameter):
         """
-        Parse a variadic parameter and increment the cursor.
+        Parse the arguments for a variadic parameter from the cursor
+        until the next prefixed string and increment the cursor.
         :param parameter: The parameter.
+        :return: The arguments, or None if there were none.
         """
-        self.__increment_cursor()
         closure_arguments = []
-        available = len(self.__argv) >= self.__cursor
-        argument = None
-        if available:
-            argument = self.__argv[self.__cursor]
-        while available and argument is not None \
-                and not self.__prefix_exists(argument):
-            closure_arguments.append(argument)
+        while len(self.__argv) > self.__cursor \
+                and not self.__prefix_exists(self.__argv[self.__cursor]):
+            closure_arguments.append(self.__argv[self.__cursor])
             self.__increment_cursor()
-            available = len(self.__argv) > self.__cursor
-            argument = None
-            if available:
-                argument = self.__argv[self.__cursor]
         if len(closure_arguments) > 0:
-            name = parameter.name \
-                if not parameter.has_parent() else parameter.parent.name
-            self.results[name] = parameter.closure(*closure_arguments)
+            return closure_arguments
+        self.valid = False
+        error = ParseException(
+            "Invalid argument count. Expecting 1+ but received " +
+            str(len(closure_arguments)) + ".",
+            ParseException.INVALID_ARGUMENT_COUNT_VARIADIC_ALIAS
+            if parameter.has_parent()
+            else ParseException.INVALID_ARGUMENT_COUNT_VARIADIC_PARAMETER,
+            parameter
+        )
+        if self.error_handler is not None:
+            self.error_handler(error)
         else:
-            self.valid = False
-            error = ParseException(
-                "Invalid argument count. Expecting 1+ but received " +
-                str(len(closure_arguments)) + ".",
-                ParseException.INVALID_ARGUMENT_COUNT_VARIADIC_ALIAS
-                if parameter.has_parent()
-                else ParseException.INVALID_ARGUMENT_COUNT_VARIADIC_PARAMETER,
-                parameter
-            )
-            if self.error_handler is not None:
-                self.error_handler(error)
+            raise error
+
+    def __parse_positionals(self):
+        """
+        Fill the positional Parameters with the collected arguments,
+        calling each closure once. Filling stops at the first positional
+        Parameter without enough arguments, which invalidates the parser
+        if it or any positional Parameter after it is required. Any
+        arguments left over are passed to the default handler.
+        """
+        arguments = self.__positionals
+        offset = 0
+        for position, positional in enumerate(self.cluster.positionals):
+            arg_spec = positional.get_arg_spec()
+            count = len(arg_spec.args)
+            if arg_spec.varargs is not None:
+                closure_arguments = arguments[offset:]
+                satisfied = len(closure_arguments) > count
             else:
-                raise error
+                closure_arguments = arguments[offset:offset + count]
+                satisfied = len(closure_arguments) == count
+            if not satisfied:
+                for missing in self.cluster.positionals[position:]:
+                    if missing.required:
+                        self.valid = False
+                        error = ParseException(
+                            "Missing required argument: " + missing.name,
+                            ParseException.MISSING_REQUIRED_ARGUMENT,
+                            missing
+                        )
+                        if self.error_handler is not None:
+                            self.error_handler(error)
+                        else:
+                            raise error
+                        break
+                break
+            self.__accumulate(
+                positional, positional.closure(*closure_arguments)
+            )
+            self.__seen |= self.cluster.bits.get(positional.name, 0)
+            offset += len(closure_arguments)
+        for parameter_str in arguments[offset:]:
+            self.__call_default(parameter_str)
 
     def __respond_default(self, parameter_str):
         """
         Respond with the default handler.
         :param parameter_str: The parameter string.
         """
+        self.__call_default(parameter_str)
+        self.__increment_cursor()
+
+    def __call_default(self, parameter_str):
+        """
+        Call the default handler for a parameter string.
+        :param parameter_str: The parameter string.
+        """
         param_result = self.cluster.default(parameter_str)
         if param_result == -1:
             self.valid = False
-        self.results[parameter_str] = param_result
-        self.__increment_cursor()
+            if self.cluster.suggestion_count > 0:
+                self.__respond_unknown(parameter_str)
+        if self.__fields is None:
+            self.results[parameter_str] = param_result
+
+    def __respond_unknown(self, parameter_str):
+        """
+        Respond to an unknown parameter with the closest known parameters.
+        :param parameter_str: The parameter string.
+        """
+        suggestions = self.cluster.suggest(
+            parameter_str,
+            self.cluster.suggestion_count,
+            self.cluster.suggestion_distance
+        )
+        message = "Unknown parameter: " + parameter_str
+        if len(suggestions) > 0:
+            message += ". Did you mean " + ", ".join(suggestions) + "?"
+        error = ParseException(
+            message,
+            ParseException.UNKNOWN_PARAMETER,
+            suggestions=suggestions
+        )
+        if self.error_handler is not None:
+            self.error_handler(error)
+        else:
+            raise error
 
     def __increment_cursor(self):
         """
@@ -331,36 +561,13 @@ class Parser:
         parameter = self.__get_parameter(parameter_str)
         return parameter.closure
 
-    def __get_real_name(self, parameter_str):
-        """
-        Get the real name for a parameter based on a string parameter. If the
-        parameter found has a parent, the parent name will be returned.
-        :param parameter_str: The string parameter.
-        :return: The real name.
-        """
-        parameter = self.__get_parameter(parameter_str)
-        return parameter.name \
-            if not parameter.has_parent() else parameter.parent.name
-
     def __get_parameter(self, parameter_str):
         """
         Retrieve a Parameter based on a parameter string.
         :param parameter_str: The parameter string.
         :return: The parameter.
         """
-        last_prefix = None
-        parameter_parsed = None
-        for prefix in self.cluster.prefixes.keys():
-            if parameter_str[0:len(prefix)] == prefix:
-                parameter_str_without_prefix = parameter_str[len(prefix):]
-                if parameter_str_without_prefix \
-                        in self.cluster.prefixes[prefix]:
-                    if last_prefix is None or len(last_prefix) < len(prefix):
-                        last_prefix = prefix
-                        parameter_parsed = parameter_str_without_prefix
-        if last_prefix is not None and parameter_parsed is not None:
-            return self.cluster.prefixes[last_prefix][parameter_parsed]
-        return None
+        return self.cluster.tokens.get(parameter_str)
 
     def __prefix_exists(self, parameter_str):
         """
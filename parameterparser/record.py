@@ -0,0 +1,80 @@
+import collections
+import keyword
+import re
+
+
+class ResultRecord:
+    """
+    Used to create fixed shape record types for the results of a Cluster,
+    with one field per Parameter.
+    """
+
+    @staticmethod
+    def create_type(names, defaults):
+        """
+        Create a record type with a field for each name.
+        :param names:    The result names, in order.
+        :param defaults: The default value for each name.
+        :return:         The record type.
+        """
+        fields = ResultRecord.get_fields(names)
+
+        class ClusterResult(collections.namedtuple("ClusterResult", fields)):
+            """
+            The results of parsing with a Cluster.
+
+            The metadata and methods below start with an underscore, as
+            the namedtuple ones do, so that they never hide a field.
+
+            Attributes:
+                :var _names: The result name for each field.
+                :var _template: The default value for each field.
+                :var _indexes: The map of result names and field indexes.
+            """
+            __slots__ = ()
+
+            @classmethod
+            def _from_results(cls, results):
+                """
+                Create a record from a map of results. Results with no
+                matching field are ignored.
+                :param results: The map of result names and values.
+                :return:        The record.
+                """
+                values = list(cls._template)
+                for name, value in results.items():
+                    index = cls._indexes.get(name)
+                    if index is not None:
+                        values[index] = value
+                return cls._make(values)
+
+            def _to_dict(self):
+                """
+                Retrieve this record as a map of result names and values.
+                :return: The map of result names and values.
+                """
+                return dict(zip(self._names, self))
+
+        ClusterResult._names = tuple(names)
+        ClusterResult._template = tuple(defaults)
+        ClusterResult._indexes = dict(
+            (name, index) for index, name in enumerate(names)
+        )
+        return ClusterResult
+
+    @staticmethod
+    def get_fields(names):
+        """
+        Retrieve a unique, valid field name for each result name.
+        :param names: The result names.
+        :return:      The field names.
+        """
+        fields = []
+        for name in names:
+            field = re.sub(r"\W+", "_", name).strip("_")
+            if field == "" or field[0].isdigit() or keyword.iskeyword(field):
+                field = "parameter_" + field
+            while field in fields:
+                field += "_"
+            fields.append(field)
+        return fields
@@ -0,0 +1,158 @@
+import json
+import os
+import socket
+from parameterparser.parser import Parser
+
+try:
+    import socketserver
+except ImportError:
+    # noinspection PyUnresolvedReferences
+    import SocketServer as socketserver
+
+
+class ParseServer:
+    """
+    A long running server that keeps Clusters loaded and parses
+    string arrays sent to it over a Unix domain socket.
+
+    Each request is a single line of JSON in the form
+    {"cluster": name, "argv": [...]} and is answered with a single
+    line of JSON describing the outcome of the parse.
+
+    Attributes:
+        :var path: The path of the Unix domain socket.
+        :var clusters: The map of names and Clusters being served.
+    """
+
+    def __init__(self, path):
+        """
+        Create a new ParseServer.
+        :param path: The path of the Unix domain socket.
+        """
+        self.path = path
+        self.clusters = dict()
+        self.__server = None
+
+    def add(self, name, cluster):
+        """
+        Serve a Cluster under a name.
+        :param name:    The name clients will request.
+        :param cluster: The Cluster.
+        :return:        The server following the Fluent design pattern.
+        """
+        self.clusters[name] = cluster
+        return self
+
+    def handle(self, request):
+        """
+        Parse a single request.
+        :param request: The request, with the keys "cluster" and "argv".
+        :return:        The outcome, with the keys "results", "valid",
+                        "halted_by" and "errors".
+        """
+        if not isinstance(request, dict):
+            return {"error": "Expecting a JSON object."}
+        if request.get("cluster") not in self.clusters:
+            return {"error": "Unknown cluster: " + str(request.get("cluster"))}
+        argv = request.get("argv")
+        if not isinstance(argv, list) or len(argv) == 0:
+            return {"error": "Expecting argv to be a non-empty array."}
+        errors = []
+        try:
+            parser = Parser(argv, self.clusters[request["cluster"]])
+            parser.set_error_handler(errors.append)
+            results = parser.parse()
+        except Exception as exception:
+            return {"error": str(exception)}
+        except SystemExit as exception:
+            return {"error": "Exited with code: " + str(exception.code)}
+        return {
+            "results": results,
+            "valid": parser.is_valid(),
+            "halted_by": None
+            if parser.halted_by is None else parser.halted_by.name,
+            "errors": [
+                {
+                    "code": error.code,
+                    "message": error.message,
+                    "parameter": None
+                    if error.parameter is None else error.parameter.name,
+                    "suggestions": error.suggestions
+                }
+                for error in errors
+            ]
+        }
+
+    def serve_forever(self):
+        """
+        Listen on the Unix domain socket until shutdown() is called.
+        Each connection is handled on its own thread.
+        """
+        if os.path.exists(self.path):
+            os.remove(self.path)
+        handler = self.__get_handler()
+        self.__server = socketserver.ThreadingUnixStreamServer(
+            self.path, handler
+        )
+        self.__server.daemon_threads = True
+        try:
+            self.__server.serve_forever()
+        finally:
+            self.__server.server_close()
+            if os.path.exists(self.path):
+                os.remove(self.path)
+
+    def shutdown(self):
+        """
+        Stop a server started using serve_forever().
+        """
+        if self.__server is not None:
+            self.__server.shutdown()
+
+    def __get_handler(self):
+        """
+        Retrieve the request handler class bound to this server.
+        :return: The request handler class.
+        """
+        server = self
+
+        class Handler(socketserver.StreamRequestHandler):
+            def handle(self):
+                for line in self.rfile:
+                    if len(line.strip()) == 0:
+                        continue
+                    try:
+                        response = server.handle(json.loads(line.decode()))
+                    except ValueError as exception:
+                        response = {"error": str(exception)}
+                    self.wfile.write(
+                        (json.dumps(response, default=str) + "\n").encode()
+                    )
+                    self.wfile.flush()
+
+        return Handler
+
+
+def parse_remote(path, cluster, argv):
+    """
+    Parse a string array using a Cluster loaded in a ParseServer.
+    :param path:    The path of the Unix domain socket.
+    :param cluster: The name of the Cluster.
+    :param argv:    The string array to parse.
+    :return:        The outcome, see ParseServer.handle().
+    """
+    connection = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+    try:
+        connection.connect(path)
+        connection.sendall(
+            (json.dumps({"cluster": cluster, "argv": argv}) + "\n").encode()
+        )
+        response = b""
+        while not response.endswith(b"\n"):
+            chunk = connection.recv(65536)
+            if not chunk:
+                break
+            response += chunk
+    finally:
+        connection.close()
+    return json.loads(response.decode())
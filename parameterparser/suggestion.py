@@ -0,0 +1,86 @@
+class SuggestionIndex:
+    """
+    A BK-tree over the tokens of a Cluster, used to find the tokens
+    closest to an unknown token without comparing against every one.
+
+    Attributes:
+        :var size: The number of tokens in this index.
+    """
+
+    def __init__(self, tokens=None):
+        """
+        Create a new SuggestionIndex.
+        :param tokens: The tokens to index, if any.
+        """
+        self.size = 0
+        self.__root = None
+        if tokens is not None:
+            for token in tokens:
+                self.add(token)
+
+    def add(self, token):
+        """
+        Add a token to this index.
+        :param token: The token.
+        :return:      This index following the Fluent design pattern.
+        """
+        if self.__root is None:
+            self.__root = (token, {})
+            self.size += 1
+            return self
+        node = self.__root
+        while True:
+            distance = SuggestionIndex.distance(token, node[0])
+            if distance == 0:
+                return self
+            if distance not in node[1]:
+                node[1][distance] = (token, {})
+                self.size += 1
+                return self
+            node = node[1][distance]
+
+    def suggest(self, token, count=3, max_distance=2):
+        """
+        Retrieve the tokens in this index closest to a token.
+        :param token:        The token.
+        :param count:        The maximum number of suggestions.
+        :param max_distance: The maximum edit distance of a suggestion.
+        :return:             The suggestions, closest first.
+        """
+        matches = []
+        if self.__root is None:
+            return matches
+        pending = [self.__root]
+        while len(pending) > 0:
+            node = pending.pop()
+            distance = SuggestionIndex.distance(token, node[0])
+            if distance <= max_distance:
+                matches.append((distance, node[0]))
+            low = distance - max_distance
+            high = distance + max_distance
+            for child_distance, child in node[1].items():
+                if low <= child_distance <= high:
+                    pending.append(child)
+        return [match for _, match in sorted(matches)[:count]]
+
+    @staticmethod
+    def distance(first, second):
+        """
+        Calculate the Levenshtein distance between two strings.
+        :param first:  The first string.
+        :param second: The second string.
+        :return:       The number of edits between the two strings.
+        """
+        if len(first) < len(second):
+            first, second = second, first
+        previous = list(range(len(second) + 1))
+        for i, first_char in enumerate(first):
+            current = [i + 1]
+            for j, second_char in enumerate(second):
+                current.append(min(
+                    previous[j + 1] + 1,
+                    current[j] + 1,
+                    previous[j] + (first_char != second_char)
+                ))
+            previous = current
+        return previous[-1]
@@ -0,0 +1,422 @@
+"""
+Differential fuzz harness for the Parser.
+
+Random Clusters and string arrays are parsed by the reference backend
+and by every other backend in BACKENDS, and the outcomes (results,
+validity, halting parameter, errors) are compared. Any mismatch is
+shrunk to a minimal Cluster and string array and printed.
+
+Usage: python tests/fuzz.py [iterations] [seed]
+
+To guard a new parsing backend, add a function taking a Cluster spec
+and a string array and returning outcome(parser, errors) to BACKENDS.
+"""
+import os
+import random
+import sys
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), ".."))
+
+from parameterparser import Cluster, Parameter, Parser, Result  # noqa: E402
+
+PREFIXES = ["-", "--", "/", "+"]
+NAMES = ["a", "b", "ab", "v", "-a", "name", "x"]
+WORDS = ["one", "two", "'q", "w'", "'solo'", "\"d", "e\"", "a b", "", "-"]
+ACCUMULATE = [
+    Parameter.ACCUMULATE_LAST,
+    Parameter.ACCUMULATE_APPEND,
+    Parameter.ACCUMULATE_COUNT
+]
+
+
+def make_closure(name, count, variadic, halt):
+    """
+    Build a closure with a specific arity that records its arguments.
+    :param name:     The name recorded in the value.
+    :param count:    The number of arguments.
+    :param variadic: Whether the closure takes *args.
+    :param halt:     None, "bare" to halt without a value or "value"
+                     to halt with a value.
+    :return:         The closure.
+    """
+    arguments = ["a" + str(i) for i in range(count)]
+    if variadic:
+        arguments.append("*rest")
+    values = "(%r,) + tuple([%s])" % (name, ", ".join(
+        ["a" + str(i) for i in range(count)]
+    ))
+    if variadic:
+        values += " + tuple(rest)"
+    if halt == "bare":
+        body = "Result.halt()"
+    elif halt == "value":
+        body = "Result.halt(%s)" % values
+    else:
+        body = values
+    return eval("lambda " + ", ".join(arguments) + ": " + body, {
+        "Result": Result
+    })
+
+
+def build_cluster(spec, incremental=False):
+    """
+    Build a Cluster from a spec.
+    :param spec:        The Cluster spec.
+    :param incremental: Whether to configure each Parameter after adding
+                        it and to add and remove a decoy Parameter around
+                        it, exercising the incremental Cluster indexes.
+    :return:            The Cluster.
+    """
+    cluster = Cluster()
+    for parameter_spec in spec["parameters"]:
+        if incremental:
+            decoy = Parameter(parameter_spec["prefix"], "decoy", lambda: None)
+            cluster.add(decoy.add_alias(parameter_spec["name"]))
+        parameter = Parameter(
+            parameter_spec["prefix"],
+            parameter_spec["name"],
+            make_closure(
+                parameter_spec["name"],
+                parameter_spec["count"],
+                parameter_spec["variadic"],
+                parameter_spec["halt"]
+            )
+        )
+        if incremental:
+            cluster.add(parameter)
+        parameter.set_required(parameter_spec["required"])
+        parameter.set_halting(parameter_spec["halting"])
+        parameter.set_accumulate(parameter_spec["accumulate"])
+        for alias_prefix, alias in parameter_spec["aliases"]:
+            parameter.add_alias(alias, alias_prefix)
+        if incremental:
+            cluster.remove(decoy.prefix, decoy.name)
+        else:
+            cluster.add(parameter)
+    for positional_spec in spec["positionals"]:
+        cluster.add_positional(
+            positional_spec["name"],
+            make_closure(
+                positional_spec["name"],
+                positional_spec["count"],
+                positional_spec["variadic"],
+                None
+            ),
+            positional_spec["required"]
+        )
+    for kind, names, dependencies in spec["constraints"]:
+        if kind == Cluster.CONSTRAINT_EXACTLY_ONE:
+            cluster.add_exactly_one(names)
+        elif kind == Cluster.CONSTRAINT_AT_MOST_ONE:
+            cluster.add_at_most_one(names)
+        else:
+            cluster.add_dependency(names[0], dependencies)
+    if spec["suggestions"]:
+        cluster.set_suggestions()
+    return cluster
+
+
+def outcome(parser, errors):
+    """
+    Describe the outcome of a parse so that it can be compared.
+    :param parser: The Parser after parsing.
+    :param errors: The ParseExceptions passed to the error handler.
+    :return:       The outcome.
+    """
+    return {
+        "results": sorted(
+            (repr(key), repr(value)) for key, value in parser.results.items()
+        ),
+        "valid": parser.is_valid(),
+        "halted_by": None
+        if parser.halted_by is None else parser.halted_by.name,
+        "errors": [
+            (
+                error.code,
+                None if error.parameter is None else error.parameter.name,
+                list(error.suggestions)
+            )
+            for error in errors
+        ]
+    }
+
+
+def reference_backend(spec, argv):
+    """
+    Parse using a new Parser and a new Cluster.
+    :param spec: The Cluster spec.
+    :param argv: The string array.
+    :return:     The outcome.
+    """
+    errors = []
+    parser = Parser(argv, build_cluster(spec))
+    parser.set_error_handler(errors.append)
+    parser.parse()
+    return outcome(parser, errors)
+
+
+def warm_backend(spec, argv):
+    """
+    Parse using a Parser and Cluster that have already parsed every
+    string in the spec, exercising anything cached between parses.
+    :param spec: The Cluster spec.
+    :param argv: The string array.
+    :return:     The outcome.
+    """
+    errors = []
+    parser = Parser(None, build_cluster(spec))
+    parser.set_error_handler(errors.append)
+    try:
+        parser.parse(
+            ["app", "unknown"] + random_argv(random.Random(0), spec)[1:],
+            parser.cluster
+        )
+    except Exception:
+        pass
+    del errors[:]
+    parser.parse(argv, parser.cluster)
+    return outcome(parser, errors)
+
+
+def incremental_backend(spec, argv):
+    """
+    Parse using a Cluster built by adding, configuring and removing
+    Parameters one change at a time.
+    :param spec: The Cluster spec.
+    :param argv: The string array.
+    :return:     The outcome.
+    """
+    errors = []
+    parser = Parser(argv, build_cluster(spec, True))
+    parser.set_error_handler(errors.append)
+    parser.parse()
+    return outcome(parser, errors)
+
+
+BACKENDS = {
+    "warm": warm_backend,
+    "incremental": incremental_backend
+}
+
+
+def run(backend, spec, argv):
+    """
+    Run a backend, capturing any exception as part of the outcome.
+    :param backend: The backend.
+    :param spec:    The Cluster spec.
+    :param argv:    The string array.
+    :return:        The outcome.
+    """
+    try:
+        return backend(spec, argv)
+    except Exception as exception:
+        return {"exception": type(exception).__name__}
+
+
+def mismatch(backend, spec, argv):
+    """
+    Check if a backend disagrees with the reference backend.
+    :param backend: The backend.
+    :param spec:    The Cluster spec.
+    :param argv:    The string array.
+    :return:        True if the outcomes differ.
+    """
+    return run(reference_backend, spec, argv) != run(backend, spec, argv)
+
+
+def random_spec(rng):
+    """
+    Generate a random Cluster spec.
+    :param rng: The random number generator.
+    :return:    The spec.
+    """
+    parameters = []
+    for _ in range(rng.randint(1, 6)):
+        variadic = rng.random() < 0.25
+        parameters.append({
+            "prefix": rng.choice(PREFIXES),
+            "name": rng.choice(NAMES),
+            "count": rng.choice([0, 0, 1, 1, 2]),
+            "variadic": variadic,
+            "halt": rng.choice([None, None, None, "bare", "value"]),
+            "required": rng.random() < 0.15,
+            "halting": rng.random() < 0.1,
+            "accumulate": rng.choice(ACCUMULATE),
+            "aliases": [
+                (rng.choice(PREFIXES), rng.choice(NAMES))
+                for _ in range(rng.choice([0, 0, 1, 2]))
+            ]
+        })
+    positionals = []
+    for i in range(rng.choice([0, 0, 1, 2])):
+        positionals.append({
+            "name": "p" + str(i),
+            "count": rng.choice([1, 1, 2]),
+            "variadic": False,
+            "required": rng.random() < 0.3
+        })
+    if len(positionals) > 0 and rng.random() < 0.5:
+        positionals[-1]["variadic"] = True
+        positionals[-1]["count"] = 0
+    constraints = []
+    known = sorted(set(
+        [parameter["name"] for parameter in parameters]
+        + [positional["name"] for positional in positionals]
+    ))
+    for _ in range(rng.choice([0, 0, 1, 2]) if len(known) > 1 else 0):
+        kind = rng.choice([
+            Cluster.CONSTRAINT_EXACTLY_ONE,
+            Cluster.CONSTRAINT_AT_MOST_ONE,
+            Cluster.CONSTRAINT_DEPENDENCY
+        ])
+        names = rng.sample(known, min(3, len(known)))
+        if kind == Cluster.CONSTRAINT_DEPENDENCY:
+            constraints.append((kind, names[:1], names[1:]))
+        else:
+            constraints.append((kind, names, []))
+    return {
+        "parameters": parameters,
+        "positionals": positionals,
+        "constraints": constraints,
+        "suggestions": rng.random() < 0.2
+    }
+
+
+def random_argv(rng, spec):
+    """
+    Generate a random string array for a Cluster spec.
+    :param rng:  The random number generator.
+    :param spec: The Cluster spec.
+    :return:     The string array.
+    """
+    tokens = list(WORDS)
+    for parameter_spec in spec["parameters"]:
+        tokens.append(parameter_spec["prefix"] + parameter_spec["name"])
+        for alias_prefix, alias in parameter_spec["aliases"]:
+            tokens.append(alias_prefix + alias)
+    tokens += [rng.choice(PREFIXES) + rng.choice(NAMES) for _ in range(3)]
+    return ["app"] + [rng.choice(tokens) for _ in range(rng.randint(0, 12))]
+
+
+def shrink(backend, spec, argv):
+    """
+    Shrink a mismatch by removing strings, Parameters, aliases and
+    positional Parameters for as long as the mismatch remains.
+    :param backend: The backend.
+    :param spec:    The Cluster spec.
+    :param argv:    The string array.
+    :return:        The minimal (spec, argv).
+    """
+    progress = True
+    while progress:
+        progress = False
+        for candidate_spec, candidate_argv in candidates(spec, argv):
+            if mismatch(backend, candidate_spec, candidate_argv):
+                spec, argv = candidate_spec, candidate_argv
+                progress = True
+                break
+    return spec, argv
+
+
+def candidates(spec, argv):
+    """
+    Generate every spec and string array one step smaller than these.
+    :param spec: The Cluster spec.
+    :param argv: The string array.
+    :return:     The candidates.
+    """
+    for i in range(1, len(argv)):
+        yield spec, argv[:i] + argv[i + 1:]
+    for key in ["parameters", "positionals", "constraints"]:
+        for i in range(len(spec[key])):
+            smaller = dict(spec)
+            smaller[key] = spec[key][:i] + spec[key][i + 1:]
+            yield smaller, argv
+    for i, parameter_spec in enumerate(spec["parameters"]):
+        simpler = []
+        for j in range(len(parameter_spec["aliases"])):
+            simpler.append({"aliases": (
+                parameter_spec["aliases"][:j]
+                + parameter_spec["aliases"][j + 1:]
+            )})
+        if parameter_spec["required"]:
+            simpler.append({"required": False})
+        if parameter_spec["halting"]:
+            simpler.append({"halting": False})
+        if parameter_spec["halt"] is not None:
+            simpler.append({"halt": None})
+        if parameter_spec["accumulate"] != Parameter.ACCUMULATE_LAST:
+            simpler.append({"accumulate": Parameter.ACCUMULATE_LAST})
+        for change in simpler:
+            parameter_copy = dict(parameter_spec)
+            parameter_copy.update(change)
+            smaller = dict(spec)
+            smaller["parameters"] = list(spec["parameters"])
+            smaller["parameters"][i] = parameter_copy
+            yield smaller, argv
+    if spec["suggestions"]:
+        smaller = dict(spec)
+        smaller["suggestions"] = False
+        yield smaller, argv
+
+
+def find_mismatch(iterations, seed, arrays=5):
+    """
+    Search for a mismatch between the reference backend and every
+    backend in BACKENDS.
+    :param iterations: The number of Cluster specs to generate.
+    :param seed:       The seed of the random number generator.
+    :param arrays:     The number of string arrays to parse per spec.
+    :return:           The iteration, backend name and the shrunk spec
+                       and string array of the first mismatch, or None.
+    """
+    rng = random.Random(seed)
+    for iteration in range(iterations):
+        spec = random_spec(rng)
+        for _ in range(arrays):
+            string_array = random_argv(rng, spec)
+            for name, backend in sorted(BACKENDS.items()):
+                if mismatch(backend, spec, string_array):
+                    spec, string_array = shrink(backend, spec, string_array)
+                    return iteration, name, spec, string_array
+    return None
+
+
+def describe(name, spec, argv):
+    """
+    Describe a mismatch found using find_mismatch().
+    :param name: The backend name.
+    :param spec: The Cluster spec.
+    :param argv: The string array.
+    :return:     The description.
+    """
+    return "\n".join([
+        "Spec: " + repr(spec),
+        "Argv: " + repr(argv),
+        "Reference: " + repr(run(reference_backend, spec, argv)),
+        name.title() + ": " + repr(run(BACKENDS[name], spec, argv))
+    ])
+
+
+def main(argv):
+    """
+    Run the fuzz harness.
+    :param argv: The string array to use.
+    :return:     The exit code.
+    """
+    iterations = int(argv[1]) if len(argv) > 1 else 2000
+    seed = int(argv[2]) if len(argv) > 2 else random.randint(0, 2 ** 31)
+    print("Seed: " + str(seed))
+    found = find_mismatch(iterations, seed)
+    if found is not None:
+        iteration, name, spec, string_array = found
+        print("Mismatch in backend " + name + " (iteration "
+              + str(iteration) + ")")
+        print(describe(name, spec, string_array))
+        return 1
+    print("No mismatches in " + str(iterations) + " iterations.")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main(sys.argv))
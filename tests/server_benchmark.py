@@ -0,0 +1,84 @@
+"""
+Compare parsing through a resident ParseServer with cold Parser
+invocations that start Python and build the Cluster every time.
+
+Usage: python tests/server_benchmark.py [runs] [parameters]
+"""
+import os
+import subprocess
+import sys
+import tempfile
+import threading
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), ".."))
+
+from parameterparser import Cluster, Parameter, Parser  # noqa: E402
+from parameterparser.server import ParseServer, parse_remote  # noqa: E402
+
+runs = int(sys.argv[1]) if len(sys.argv) > 1 else 20
+parameter_count = int(sys.argv[2]) if len(sys.argv) > 2 else 500
+root = os.path.abspath(os.path.join(os.path.dirname(__file__), ".."))
+argv = ["app", "-p0", "value", "-p1", "'quoted", "value'", "-p2", "x"]
+
+cold_source = """
+import sys
+sys.path.insert(0, %r)
+from parameterparser import Cluster, Parameter, Parser
+cluster = Cluster()
+for i in range(%d):
+    cluster.add(Parameter("-", "p" + str(i), lambda value: value))
+Parser(%r, cluster).parse()
+""" % (root, parameter_count, argv)
+
+client_source = """
+import json, socket
+connection = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+connection.connect(%r)
+request = json.dumps({"cluster": "app", "argv": %r}) + "\\n"
+connection.sendall(request.encode())
+connection.recv(65536)
+"""
+
+
+def build_cluster():
+    cluster = Cluster()
+    for i in range(parameter_count):
+        cluster.add(Parameter("-", "p" + str(i), lambda value: value))
+    return cluster
+
+
+def timed(function):
+    start = time.time()
+    for _ in range(runs):
+        function()
+    return (time.time() - start) / runs * 1000
+
+
+socket_path = os.path.join(tempfile.mkdtemp(), "parameterparser.sock")
+server = ParseServer(socket_path).add("app", build_cluster())
+thread = threading.Thread(target=server.serve_forever)
+thread.daemon = True
+thread.start()
+while not os.path.exists(socket_path):
+    time.sleep(0.01)
+
+results = [
+    ("cold process", timed(
+        lambda: subprocess.check_call([sys.executable, "-c", cold_source])
+    )),
+    ("client process", timed(
+        lambda: subprocess.check_call([
+            sys.executable, "-S", "-c", client_source % (socket_path, argv)
+        ])
+    )),
+    ("in process, cold", timed(lambda: Parser(argv, build_cluster()).parse())),
+    ("in process, server", timed(lambda: parse_remote(
+        socket_path, "app", argv
+    ))),
+]
+server.shutdown()
+
+print("%d parameters, %d runs" % (parameter_count, runs))
+for name, milliseconds in results:
+    print("%-20s %8.3f ms" % (name, milliseconds))
@@ -0,0 +1,58 @@
+import os
+import sys
+import unittest
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), ".."))
+
+from parameterparser import Cluster, Parameter, Parser  # noqa: E402
+
+
+class AccumulateTest(unittest.TestCase):
+    """
+    Tests for the accumulation modes of repeated Parameters.
+    """
+
+    def parse(self, accumulate, argv):
+        """
+        Parse a string array with a Parameter -v using an accumulation
+        mode and a Default Handler returning the argument.
+        :param accumulate: The accumulation mode.
+        :param argv:       The string array.
+        :return:           The results.
+        """
+        cluster = Cluster() \
+            .add(Parameter("-", "v", lambda: "x").set_accumulate(accumulate)) \
+            .set_default(lambda parameter: parameter)
+        return Parser(argv, cluster).parse()
+
+    def test_modes(self):
+        argv = ["app", "-v", "-v", "-v"]
+        self.assertEqual(
+            self.parse(Parameter.ACCUMULATE_LAST, argv), {"v": "x"}
+        )
+        self.assertEqual(
+            self.parse(Parameter.ACCUMULATE_APPEND, argv),
+            {"v": ["x", "x", "x"]}
+        )
+        self.assertEqual(
+            self.parse(Parameter.ACCUMULATE_COUNT, argv), {"v": 3}
+        )
+        self.assertEqual(
+            self.parse(lambda total, value: total + value, argv),
+            {"v": "xxx"}
+        )
+
+    def test_default_handler_result_with_the_same_name(self):
+        for argv in [["app", "v", "-v"], ["app", "-v", "v", "-v"]]:
+            self.assertEqual(
+                self.parse(Parameter.ACCUMULATE_COUNT, argv)["v"],
+                argv.count("-v")
+            )
+            self.assertEqual(
+                self.parse(Parameter.ACCUMULATE_APPEND, argv)["v"],
+                ["x"] * argv.count("-v")
+            )
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,73 @@
+import os
+import sys
+import unittest
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), ".."))
+
+from parameterparser import Cluster, Parameter, Parser  # noqa: E402
+
+
+class ClusterTest(unittest.TestCase):
+    """
+    Tests for the indexes kept by a Cluster.
+    """
+
+    def test_usage_widths_survive_a_failed_measurement(self):
+        cluster = Cluster() \
+            .add(Parameter("-", "averyveryverylongname", lambda: None)) \
+            .add(Parameter("-", "bad", lambda **kwargs: None))
+        self.assertRaises(Exception, cluster.get_usage_widths)
+        self.assertRaises(Exception, cluster.get_usage_widths)
+        cluster.remove("-", "averyveryverylongname")
+        cluster.remove("-", "bad")
+        cluster.add(Parameter("-", "a", lambda: None))
+        self.assertEqual(cluster.get_usage_widths()["parameter"], 2)
+
+    def test_constraint_with_unknown_name_is_rejected(self):
+        cluster = Cluster() \
+            .add(Parameter("-", "a", lambda: True)) \
+            .add_exactly_one(["a", "typo"])
+        self.assertRaises(Exception, cluster.get_constraint_masks)
+        self.assertNotIn("typo", cluster.bits)
+
+    def test_constraint_with_unknown_name_fails_before_parsing(self):
+        called = []
+        cluster = Cluster() \
+            .add(Parameter("-", "a", lambda: called.append("a"))) \
+            .add_at_most_one(["a", "typo"])
+        for argv in [["app", "-a"], ["app", "-zz"]]:
+            parser = Parser(None, cluster)
+            parser.set_error_handler(lambda error: None)
+            self.assertRaises(Exception, parser.parse, argv)
+        self.assertEqual(called, [])
+
+    def test_bits_are_reused_after_remove(self):
+        cluster = Cluster()
+        for i in range(100):
+            cluster.add(Parameter("-", "plugin" + str(i), lambda: True))
+            cluster.remove("-", "plugin" + str(i))
+        self.assertEqual(cluster.bits, {})
+        cluster.add(Parameter("-", "a", lambda: True)) \
+            .add(Parameter("-", "b", lambda: True)) \
+            .add_at_most_one(["a", "b"])
+        self.assertEqual(sorted(cluster.bits.values()), [1, 2])
+        errors = []
+        parser = Parser(["app", "-a", "-b"], cluster)
+        parser.set_error_handler(errors.append)
+        parser.parse()
+        self.assertFalse(parser.is_valid())
+        self.assertEqual(len(errors), 1)
+
+    def test_bit_is_kept_while_a_name_is_in_use(self):
+        cluster = Cluster() \
+            .add(Parameter("-", "a", lambda: True)) \
+            .add(Parameter("--", "a", lambda: True))
+        bit = cluster.bits["a"]
+        cluster.remove("-", "a")
+        self.assertEqual(cluster.bits, {"a": bit})
+        cluster.remove("--", "a")
+        self.assertEqual(cluster.bits, {})
+
+
+if __name__ == "__main__":
+    unittest.main()
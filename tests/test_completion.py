@@ -0,0 +1,116 @@
+import os
+import shutil
+import subprocess
+import sys
+import tempfile
+import unittest
+
+try:
+    from StringIO import StringIO
+except ImportError:
+    from io import StringIO
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), ".."))
+
+from parameterparser import Cluster, Parameter, complete  # noqa: E402
+from parameterparser.completion import CompletionIndex  # noqa: E402
+
+
+class CompletionTest(unittest.TestCase):
+    """
+    Tests for completing command lines using a CompletionIndex.
+    """
+
+    def setUp(self):
+        self.directory = tempfile.mkdtemp()
+        self.cluster = Cluster() \
+            .add(Parameter("-", "flag", lambda: True)) \
+            .add(Parameter("-", "pair", lambda a, b: (a, b))) \
+            .add(Parameter("-", "files", lambda *files: files)) \
+            .add(Parameter("-", "mixed", lambda a, *rest: rest)
+                 .add_alias("mix", "--"))
+
+    def tearDown(self):
+        shutil.rmtree(self.directory)
+
+    def test_complete(self):
+        self.assertEqual(
+            self.cluster.complete(["app", "-f"], 1), ["-files", "-flag"]
+        )
+        self.assertEqual(self.cluster.complete(["app", "--"], 1), ["--mix"])
+        self.assertEqual(self.cluster.complete(["app", "x"], 1), [])
+        self.assertEqual(len(self.cluster.complete(["app"], 1)), 5)
+
+    def test_in_argument_slot(self):
+        index = self.cluster.get_completion_index()
+        cases = [
+            (["app", "-flag", ""], False),
+            (["app", "-pair", ""], True),
+            (["app", "-pair", "a", ""], True),
+            (["app", "-pair", "a", "b", ""], False),
+            (["app", "-files", "-"], True),
+            (["app", "-files", "a", "b", ""], True),
+            (["app", "-files", "a", "-"], False),
+            (["app", "-mixed", "-"], True),
+            (["app", "-mixed", "a", "-"], True),
+            (["app", "-mixed", "a", "b", ""], True),
+            (["app", "-mixed", "a", "b", "-"], False),
+            (["app", "--mix", "a", "b", "-"], False),
+            (["app", "unknown", ""], False)
+        ]
+        for words, expected in cases:
+            self.assertEqual(
+                index.in_argument_slot(words, len(words) - 1), expected, words
+            )
+
+    def test_save_and_load(self):
+        path = os.path.join(self.directory, "cache.json")
+        index = self.cluster.get_completion_index().save(path)
+        loaded = CompletionIndex.load(path)
+        self.assertEqual(loaded.tokens, index.tokens)
+        self.assertEqual(loaded.arities, index.arities)
+        self.assertEqual(loaded.prefixes, index.prefixes)
+
+    def test_main(self):
+        path = os.path.join(self.directory, "cache.json")
+        self.cluster.get_completion_index().save(path)
+        stdout = sys.stdout
+        sys.stdout = StringIO()
+        try:
+            complete.main(["complete", path, "2", "app", "-flag", "-p"])
+            output = sys.stdout.getvalue()
+        finally:
+            sys.stdout = stdout
+        self.assertEqual(output, "-pair\n")
+
+    def test_scripts_quote_paths(self):
+        path = os.path.join(self.directory, "it's a cache.json")
+        python = "/opt/my python/bin/python"
+        for script in [
+            CompletionIndex.get_bash_script("app", path, python),
+            CompletionIndex.get_zsh_script("app", path, python)
+        ]:
+            self.assertNotIn(" " + path + " ", script)
+            self.assertNotIn("$(" + python + " ", script)
+
+    @unittest.skipIf(
+        not os.path.exists("/bin/bash"), "bash is not available"
+    )
+    def test_bash_script(self):
+        path = os.path.join(self.directory, "it's a cache.json")
+        self.cluster.get_completion_index().save(path)
+        script = CompletionIndex.get_bash_script("app", path, sys.executable)
+        environment = dict(os.environ)
+        environment["PYTHONPATH"] = os.path.abspath(
+            os.path.join(os.path.dirname(__file__), "..")
+        )
+        output = subprocess.check_output([
+            "/bin/bash", "-c",
+            script + "COMP_WORDS=(app -fl); COMP_CWORD=1; _app_complete; "
+            "printf '%s\\n' \"${COMPREPLY[@]}\""
+        ], env=environment)
+        self.assertEqual(output.decode(), "-flag\n")
+
+
+if __name__ == "__main__":
+    unittest.main()
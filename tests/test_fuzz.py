@@ -0,0 +1,27 @@
+import os
+import sys
+import unittest
+
+sys.path.insert(0, os.path.dirname(__file__))
+
+import fuzz  # noqa: E402
+
+
+class FuzzTest(unittest.TestCase):
+    """
+    Runs a short, fixed seed pass of the differential fuzz harness. Use
+    tests/fuzz.py directly for longer runs with random seeds.
+    """
+
+    def test_backends_agree_with_reference(self):
+        found = fuzz.find_mismatch(100, 0, 3)
+        if found is not None:
+            iteration, name, spec, argv = found
+            self.fail(
+                "Mismatch in backend " + name + "\n"
+                + fuzz.describe(name, spec, argv)
+            )
+
+
+if __name__ == "__main__":
+    unittest.main()
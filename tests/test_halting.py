@@ -0,0 +1,94 @@
+import os
+import sys
+import unittest
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), ".."))
+
+from parameterparser import Cluster, Parameter, Parser, Result  # noqa: E402
+
+
+class HaltingTest(unittest.TestCase):
+    """
+    Tests for Parameters declared as halting using set_halting().
+    """
+
+    def setUp(self):
+        self.called = []
+        self.cluster = Cluster() \
+            .add(Parameter("-", "name", self.record("name"))
+                 .set_required(True)) \
+            .add(Parameter("--", "help", lambda: Result.halt())
+                 .set_halting(True)
+                 .add_alias("h", "-")) \
+            .add(Parameter("--", "version", lambda style: Result.halt(style))
+                 .set_halting(True)) \
+            .add(Parameter("-", "x", self.record("x")))
+
+    def record(self, name):
+        """
+        Create a closure recording that it was called.
+        :param name: The name recorded.
+        :return:     The closure.
+        """
+        def closure(value):
+            self.called.append(name)
+            return value
+        return closure
+
+    def parse(self, argv):
+        """
+        Parse a string array, collecting any errors.
+        :param argv: The string array.
+        :return:     The Parser, the results and the errors.
+        """
+        errors = []
+        parser = Parser(argv, self.cluster)
+        parser.set_error_handler(errors.append)
+        return parser, parser.parse(), errors
+
+    def test_required_parameters_are_not_verified(self):
+        parser, results, errors = self.parse(["app", "--help"])
+        self.assertEqual(results, {})
+        self.assertTrue(parser.is_valid())
+        self.assertEqual(parser.halted_by.name, "help")
+        self.assertEqual(errors, [])
+
+    def test_only_the_halting_parameter_is_parsed(self):
+        parser, results, errors = self.parse([
+            "app", "-x", "1", "--version", "json", "extra", "-x", "2"
+        ])
+        self.assertEqual(results, {"version": "json"})
+        self.assertTrue(parser.is_valid())
+        self.assertEqual(parser.halted_by.name, "version")
+        self.assertEqual(self.called, [])
+
+    def test_missing_halting_arguments(self):
+        parser, results, errors = self.parse(["app", "--version"])
+        self.assertFalse(parser.is_valid())
+        self.assertIsNone(parser.halted_by)
+        self.assertEqual(len(errors), 1)
+
+    def test_alias(self):
+        parser, results, errors = self.parse(["app", "-x", "1", "-h"])
+        self.assertTrue(parser.is_valid())
+        self.assertEqual(parser.halted_by.name, "h")
+        self.assertEqual(parser.halted_by.parent.name, "help")
+        self.assertEqual(self.called, [])
+
+    def test_quoted_halting_parameter(self):
+        parser, results, errors = self.parse(
+            ["app", "-name", "'hello", "--help", "world'"]
+        )
+        self.assertEqual(results, {"name": "hello --help world"})
+        self.assertIsNone(parser.halted_by)
+        self.assertTrue(parser.is_valid())
+
+    def test_halting_parameter_in_an_argument_slot(self):
+        parser, results, errors = self.parse(["app", "-name", "--help"])
+        self.assertEqual(results, {})
+        self.assertEqual(parser.halted_by.name, "help")
+        self.assertEqual(self.called, [])
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,117 @@
+import os
+import sys
+import unittest
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), ".."))
+
+from parameterparser import Cluster, Parameter, Parser  # noqa: E402
+
+
+class PositionalTest(unittest.TestCase):
+    """
+    Tests for filling positional Parameters.
+    """
+
+    def parse(self, cluster, argv, default=True):
+        """
+        Parse a string array, collecting any errors.
+        :param cluster: The Cluster.
+        :param argv:    The string array.
+        :param default: Whether to set a Default Handler accepting anything.
+        :return:        The Parser, the results and the errors.
+        """
+        if default:
+            cluster.set_default(lambda parameter: "default")
+        errors = []
+        parser = Parser(argv, cluster)
+        parser.set_error_handler(errors.append)
+        return parser, parser.parse(), errors
+
+    def test_partial_slot_without_default_handler(self):
+        cluster = Cluster().add_positional("src", lambda a, b: (a, b))
+        parser, results, errors = self.parse(
+            cluster, ["app", "onlyone"], False
+        )
+        self.assertEqual(results, {"onlyone": -1})
+        self.assertFalse(parser.is_valid())
+
+    def test_partial_slot_passes_arguments_to_default_handler(self):
+        cluster = Cluster() \
+            .add_positional("one", lambda a: a) \
+            .add_positional("pair", lambda a, b: (a, b))
+        parser, results, errors = self.parse(cluster, ["app", "x", "y"])
+        self.assertEqual(results, {"one": "x", "y": "default"})
+        self.assertTrue(parser.is_valid())
+        self.assertEqual(errors, [])
+
+    def test_leftover_arguments_after_every_slot(self):
+        cluster = Cluster().add_positional("one", lambda a: a)
+        parser, results, errors = self.parse(cluster, ["app", "x", "y", "z"])
+        self.assertEqual(
+            results, {"one": "x", "y": "default", "z": "default"}
+        )
+        self.assertTrue(parser.is_valid())
+
+    def test_missing_required_slot_keeps_arguments(self):
+        cluster = Cluster().add_positional("pair", lambda a, b: (a, b), True)
+        parser, results, errors = self.parse(cluster, ["app", "x"])
+        self.assertEqual(results, {"x": "default"})
+        self.assertFalse(parser.is_valid())
+        self.assertEqual(len(errors), 1)
+
+    def test_required_slot_after_unfilled_optional_slot(self):
+        cluster = Cluster() \
+            .add_positional("opt", lambda a: a) \
+            .add_positional("req", lambda a: a, True)
+        parser, results, errors = self.parse(cluster, ["app"])
+        self.assertEqual(results, {})
+        self.assertFalse(parser.is_valid())
+        self.assertEqual([error.parameter.name for error in errors], ["req"])
+
+    def test_variadic_tail(self):
+        cluster = Cluster() \
+            .add(Parameter("-", "v", lambda: True)) \
+            .add_positional("dest", lambda a: a) \
+            .add_positional("files", lambda *files: list(files))
+        parser, results, errors = self.parse(
+            cluster, ["app", "d", "-v", "f1", "f2"]
+        )
+        self.assertEqual(
+            results, {"dest": "d", "v": True, "files": ["f1", "f2"]}
+        )
+        self.assertTrue(parser.is_valid())
+
+    def test_empty_variadic_tail(self):
+        cluster = Cluster() \
+            .add_positional("dest", lambda a: a) \
+            .add_positional("files", lambda *files: list(files))
+        parser, results, errors = self.parse(cluster, ["app", "d"])
+        self.assertEqual(results, {"dest": "d"})
+        self.assertTrue(parser.is_valid())
+
+    def test_variadic_tail_after_partial_slot(self):
+        cluster = Cluster() \
+            .add_positional("pair", lambda a, b: (a, b)) \
+            .add_positional("files", lambda *files: list(files))
+        parser, results, errors = self.parse(cluster, ["app", "x"])
+        self.assertEqual(results, {"x": "default"})
+        self.assertTrue(parser.is_valid())
+
+    def test_name_collisions_are_rejected(self):
+        cluster = Cluster() \
+            .add(Parameter("-", "out", lambda value: value)) \
+            .add_positional("dest", lambda a: a)
+        self.assertRaises(
+            Exception, cluster.add_positional, "out", lambda a: a
+        )
+        self.assertRaises(
+            Exception, cluster.add_positional, "dest", lambda a: a
+        )
+        self.assertRaises(
+            Exception, cluster.add, Parameter("--", "dest", lambda: True)
+        )
+        self.assertEqual(len(cluster.positionals), 1)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,77 @@
+import os
+import sys
+import unittest
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), ".."))
+
+from parameterparser import Cluster, Parameter, Parser  # noqa: E402
+from parameterparser.record import ResultRecord  # noqa: E402
+
+
+class ResultRecordTest(unittest.TestCase):
+    """
+    Tests for the result records of a Cluster.
+    """
+
+    def test_fields_named_like_record_attributes(self):
+        cluster = Cluster()
+        for name in ["names", "template", "to-dict", "from-results"]:
+            cluster.add(Parameter("--", name, lambda value: value))
+        record = Parser(None, cluster).parse_record(
+            ["app", "--names", "X", "--template", "Y", "--to-dict", "Z"],
+            cluster
+        )
+        self.assertEqual(record.names, "X")
+        self.assertEqual(record.template, "Y")
+        self.assertEqual(record.to_dict, "Z")
+        self.assertEqual(record.from_results, None)
+        self.assertEqual(record._to_dict(), {
+            "names": "X",
+            "template": "Y",
+            "to-dict": "Z",
+            "from-results": None
+        })
+
+    def test_record_matches_results(self):
+        cluster = Cluster() \
+            .add(Parameter("-", "last", lambda value: value)) \
+            .add(Parameter("-", "list", lambda value: value)
+                 .set_accumulate(Parameter.ACCUMULATE_APPEND)) \
+            .add(Parameter("-", "v", lambda: True)
+                 .set_accumulate(Parameter.ACCUMULATE_COUNT)
+                 .add_alias("verbose", "--")) \
+            .add(Parameter("-", "sum", lambda value: int(value))
+                 .set_accumulate(lambda total, value: total + value)) \
+            .add(Parameter("-", "unused", lambda value: value)
+                 .set_default_value("fallback")) \
+            .add_positional("dest", lambda dest: dest) \
+            .set_default(lambda parameter: "default")
+        argv = [
+            "app", "-last", "a", "-list", "b", "-v", "out", "-last", "c",
+            "--verbose", "-sum", "1", "-list", "d", "-sum", "2", "extra"
+        ]
+        parser = Parser(None, cluster)
+        record = parser.parse_record(argv, cluster)
+        self.assertEqual(parser.results, {})
+        self.assertEqual(record._to_dict(), {
+            "last": "c",
+            "list": ["b", "d"],
+            "v": 2,
+            "sum": 3,
+            "unused": "fallback",
+            "dest": "out"
+        })
+        self.assertEqual(
+            record,
+            cluster.get_result_type()._from_results(parser.parse(argv))
+        )
+
+    def test_fields_are_valid_and_unique(self):
+        self.assertEqual(
+            ResultRecord.get_fields(["max-size", "max_size", "class", "1"]),
+            ["max_size", "max_size_", "parameter_class", "parameter_1"]
+        )
+
+
+if __name__ == "__main__":
+    unittest.main()
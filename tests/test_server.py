@@ -0,0 +1,99 @@
+import json
+import os
+import shutil
+import socket
+import sys
+import tempfile
+import threading
+import time
+import unittest
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), ".."))
+
+from parameterparser import Cluster, Parameter  # noqa: E402
+from parameterparser.server import ParseServer, parse_remote  # noqa: E402
+
+
+class ParseServerTest(unittest.TestCase):
+    """
+    Tests for the ParseServer over a Unix domain socket.
+    """
+
+    def setUp(self):
+        self.directory = tempfile.mkdtemp()
+        self.path = os.path.join(self.directory, "parameterparser.sock")
+        self.server = ParseServer(self.path).add(
+            "app", Cluster().add(Parameter("-", "name", lambda name: name))
+        )
+        self.thread = threading.Thread(target=self.server.serve_forever)
+        self.thread.daemon = True
+        self.thread.start()
+        while not os.path.exists(self.path):
+            time.sleep(0.01)
+
+    def tearDown(self):
+        self.server.shutdown()
+        self.thread.join()
+        shutil.rmtree(self.directory)
+
+    def send(self, lines):
+        """
+        Send lines over a single connection and read a reply to each.
+        :param lines: The lines.
+        :return:      The decoded replies.
+        """
+        connection = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+        connection.connect(self.path)
+        reader = connection.makefile("rb")
+        try:
+            replies = []
+            for line in lines:
+                connection.sendall((line + "\n").encode())
+                replies.append(json.loads(reader.readline().decode()))
+            return replies
+        finally:
+            reader.close()
+            connection.close()
+
+    def test_parse(self):
+        self.assertEqual(
+            parse_remote(self.path, "app", ["app", "-name", "Nathan"]),
+            {
+                "results": {"name": "Nathan"},
+                "valid": True,
+                "halted_by": None,
+                "errors": []
+            }
+        )
+
+    def test_closure_calling_exit(self):
+        self.server.clusters["app"].add(
+            Parameter("--", "help", lambda: sys.exit(0))
+        )
+        self.assertEqual(
+            parse_remote(self.path, "app", ["app", "--help"]),
+            {"error": "Exited with code: 0"}
+        )
+        self.assertEqual(
+            parse_remote(self.path, "app", ["app", "-name", "x"])["results"],
+            {"name": "x"}
+        )
+
+    def test_malformed_requests_are_answered_with_errors(self):
+        replies = self.send([
+            "not json",
+            "[\"app\"]",
+            "{\"cluster\": \"missing\", \"argv\": [\"app\"]}",
+            "{\"cluster\": \"app\"}",
+            "{\"cluster\": \"app\", \"argv\": []}",
+            "{\"cluster\": \"app\", \"argv\": \"app -name x\"}",
+            "{\"cluster\": \"app\", \"argv\": [\"app\", 1]}",
+            "{\"cluster\": \"app\", \"argv\": [\"app\", \"-name\", \"x\"]}"
+        ])
+        for reply in replies[:-1]:
+            self.assertEqual(list(reply.keys()), ["error"])
+        self.assertEqual(replies[-1]["results"], {"name": "x"})
+
+
+if __name__ == "__main__":
+    unittest.main()
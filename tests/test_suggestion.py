@@ -0,0 +1,84 @@
+import os
+import sys
+import unittest
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), ".."))
+
+from parameterparser import Cluster, Parameter, Parser  # noqa: E402
+from parameterparser import ParseException  # noqa: E402
+from parameterparser.suggestion import SuggestionIndex  # noqa: E402
+
+
+class SuggestionTest(unittest.TestCase):
+    """
+    Tests for suggesting Parameters for unknown parameter strings.
+    """
+
+    def test_distance(self):
+        self.assertEqual(SuggestionIndex.distance("", ""), 0)
+        self.assertEqual(SuggestionIndex.distance("abc", ""), 3)
+        self.assertEqual(SuggestionIndex.distance("kitten", "sitting"), 3)
+        self.assertEqual(SuggestionIndex.distance("sitting", "kitten"), 3)
+
+    def test_suggest_matches_a_linear_scan(self):
+        tokens = [
+            "--verbose", "--version", "--verb", "-v", "--help", "--hello",
+            "--output", "--out", "-o", "--input", "--in", "--inputs"
+        ]
+        index = SuggestionIndex(tokens + ["--verb"])
+        self.assertEqual(index.size, len(tokens))
+        for token in ["--verbos", "--outptu", "-x", "--in", "--hel", ""]:
+            for max_distance in range(5):
+                expected = sorted(
+                    (SuggestionIndex.distance(token, candidate), candidate)
+                    for candidate in tokens
+                    if SuggestionIndex.distance(token, candidate)
+                    <= max_distance
+                )
+                self.assertEqual(
+                    index.suggest(token, len(tokens), max_distance),
+                    [candidate for _, candidate in expected]
+                )
+
+    def test_suggest_ordering_and_count(self):
+        index = SuggestionIndex(["--verbose", "--verb", "--version"])
+        self.assertEqual(
+            index.suggest("--verbos", 3, 2), ["--verbose", "--verb"]
+        )
+        self.assertEqual(index.suggest("--verbos", 1, 2), ["--verbose"])
+        self.assertEqual(index.suggest("--verbos", 3, 0), [])
+        self.assertEqual(SuggestionIndex().suggest("--verbos"), [])
+
+    def test_cluster_suggest_without_set_suggestions(self):
+        cluster = Cluster().add(Parameter("--", "verbose", lambda: True))
+        self.assertEqual(cluster.suggest("--verbos"), ["--verbose"])
+
+    def test_unknown_parameter_error(self):
+        cluster = Cluster() \
+            .add(Parameter("--", "verbose", lambda: True)
+                 .add_alias("verb", "--")) \
+            .set_suggestions(3, 2)
+        errors = []
+        parser = Parser(["app", "--verbos"], cluster)
+        parser.set_error_handler(errors.append)
+        parser.parse()
+        self.assertFalse(parser.is_valid())
+        self.assertEqual(len(errors), 1)
+        self.assertEqual(errors[0].code, ParseException.UNKNOWN_PARAMETER)
+        self.assertEqual(errors[0].suggestions, ["--verbose", "--verb"])
+        self.assertIn("Did you mean --verbose, --verb?", errors[0].message)
+
+    def test_unknown_parameter_raises_without_error_handler(self):
+        cluster = Cluster() \
+            .add(Parameter("--", "verbose", lambda: True)) \
+            .set_suggestions()
+        try:
+            Parser(["app", "--zzzzzz"], cluster).parse()
+            self.fail("Expecting a ParseException.")
+        except ParseException as error:
+            self.assertEqual(error.code, ParseException.UNKNOWN_PARAMETER)
+            self.assertEqual(error.suggestions, [])
+
+
+if __name__ == "__main__":
+    unittest.main()